@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.db import engine as db_engine
+from app.discovery.cache import list_cached_printers
+from app.integrations.federation import LOCAL_SITE, SITE_OK, SiteResult, federation_client, merge_by_serial
+from app.models.printer import Printer, PrinterRead
+
+router = APIRouter(prefix="/federation")
+
+
+def _require_enabled() -> None:
+    if not settings.federation_enabled:
+        raise HTTPException(status_code=404, detail="Federation is disabled")
+
+
+def _local_printers() -> List[Dict[str, Any]]:
+    with Session(db_engine.engine) as session:
+        printers = session.exec(select(Printer).order_by(Printer.name, Printer.serial_number))
+        return [PrinterRead.model_validate(printer).model_dump(mode="json") for printer in printers]
+
+
+def _aggregate(results: List[SiteResult]) -> Dict[str, Any]:
+    printers = merge_by_serial(results)
+    return {"count": len(printers), "printers": printers, "sites": [result.summary() for result in results]}
+
+
+@router.get("/printer/list")
+async def federated_printer_list() -> Dict[str, Any]:
+    _require_enabled()
+    peers = await federation_client.peer_urls()
+    local, remote = await asyncio.gather(
+        asyncio.to_thread(_local_printers),
+        federation_client.fan_out(peers, "GET", "/printer/list"),
+    )
+    return _aggregate([SiteResult(LOCAL_SITE, SITE_OK, local), *remote])
+
+
+@router.post("/discover")
+async def federated_discover() -> Dict[str, Any]:
+    _require_enabled()
+    peers = await federation_client.peer_urls()
+    # Peers answer from their discovery caches so no site runs a multi-second scan.
+    local, remote = await asyncio.gather(
+        asyncio.to_thread(list_cached_printers, settings.discovery_cache_ttl_seconds),
+        federation_client.fan_out(peers, "POST", "/discover", params={"cached": "true"}, extract="printers"),
+    )
+    return _aggregate([SiteResult(LOCAL_SITE, SITE_OK, local), *remote])
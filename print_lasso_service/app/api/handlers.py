@@ -1,14 +1,22 @@
+import asyncio
 from datetime import datetime, UTC
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
+from app.config import settings
+from app.coordination.leader import leader_elector
+from app.db import engine as db_engine
 from app.db.engine import get_session
+from app.discovery.cache import list_cached_mdns_services, list_cached_printers, record_discovered_printers
 from app.discovery.ssdp import discover_bambu_printers
-from app.integrations.go2rtc import ensure_camera_stream, remove_camera_streams
+from app.discovery.sync import sync_discovered_printers
+from app.integrations.go2rtc import CameraRelayError, _is_rtsp_url, ensure_camera_stream, remove_camera_streams
+from app.integrations.snapshots import etag_matches, snapshot_cache
 from app.models.printer import Printer, PrinterCreate, PrinterDelete, PrinterRead, PrinterUpdate
+from app.startup import startup_tracker
 
 router = APIRouter()
 
@@ -18,10 +26,39 @@ def status_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@router.get("/ready")
+def readiness_check(response: Response) -> dict[str, Any]:
+    report = startup_tracker.report()
+    report["coordination"] = leader_elector.status()
+    if not report["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
+
+
 @router.post("/discover")
-def discover(include_all: bool = Query(False)) -> dict[str, Any]:
-    printers = discover_bambu_printers(include_all=include_all)
-    return {"count": len(printers), "printers": printers}
+def discover(include_all: bool = Query(False), cached: bool = Query(False)) -> dict[str, Any]:
+    if cached:
+        # Served from the discovery cache shared by all workers; no network wait.
+        printers = list_cached_printers(max_age_seconds=settings.discovery_cache_ttl_seconds)
+    else:
+        printers = discover_bambu_printers(include_all=include_all)
+        if not include_all:
+            record_discovered_printers(printers, source="active")
+            if settings.discovery_sync_enabled:
+                sync_discovered_printers(printers, source="active")
+    # mDNS services (OctoPrint, Moonraker, Prusa Link, peer services) are kept
+    # current by the leader's browser, so they are always answered from cache.
+    return {"count": len(printers), "printers": printers, "mdns_services": list_cached_mdns_services()}
+
+
+@router.post("/printer/sync")
+def sync_printers(source: Literal["cached", "active"] = Query("cached")) -> dict[str, Any]:
+    if source == "cached":
+        printers = list_cached_printers(max_age_seconds=settings.discovery_cache_ttl_seconds)
+    else:
+        printers = discover_bambu_printers(include_all=False)
+        record_discovered_printers(printers, source="active")
+    return sync_discovered_printers(printers, source=source)
 
 
 @router.post("/printer/add", response_model=PrinterRead, status_code=status.HTTP_201_CREATED)
@@ -57,6 +94,7 @@ def edit_printer(payload: PrinterUpdate, session: Session = Depends(get_session)
     session.refresh(printer)
     if old_camera_url != printer.camera_url:
         remove_camera_streams(serial_number=printer.serial_number, camera_url=old_camera_url)
+        snapshot_cache.invalidate(printer.serial_number)
     ensure_camera_stream(serial_number=printer.serial_number, camera_url=printer.camera_url)
     return printer
 
@@ -68,6 +106,7 @@ def remove_printer(payload: PrinterDelete, session: Session = Depends(get_sessio
         raise HTTPException(status_code=404, detail="Printer not found")
 
     remove_camera_streams(serial_number=printer.serial_number, camera_url=printer.camera_url)
+    snapshot_cache.invalidate(printer.serial_number)
     session.delete(printer)
     session.commit()
     return {"status": "deleted", "serial_number": payload.serial_number}
@@ -84,3 +123,36 @@ def view_printer(serial_number: str = Query(...), session: Session = Depends(get
 @router.get("/printer/list", response_model=list[PrinterRead])
 def list_printers(session: Session = Depends(get_session)) -> list[Printer]:
     return list(session.exec(select(Printer).order_by(Printer.name, Printer.serial_number)))
+
+
+def _has_camera_stream(serial_number: str) -> bool:
+    with Session(db_engine.engine) as session:
+        camera_url = session.exec(select(Printer.camera_url).where(Printer.serial_number == serial_number)).first()
+    return _is_rtsp_url(camera_url)
+
+
+@router.get("/printer/snapshot")
+async def printer_snapshot(
+    serial_number: str = Query(...),
+    if_none_match: str | None = Header(None),
+) -> Response:
+    if not settings.go2rtc_enabled:
+        raise HTTPException(status_code=404, detail="Camera relay is disabled")
+
+    try:
+        snapshot = snapshot_cache.peek(serial_number)
+        if snapshot is None:
+            # Only registered printers with an RTSP camera reach go2rtc, so polling
+            # an unknown serial costs one indexed lookup instead of an upstream fetch.
+            if not await asyncio.to_thread(_has_camera_stream, serial_number):
+                raise HTTPException(status_code=404, detail="No camera stream for this printer")
+            snapshot = await snapshot_cache.get(serial_number)
+    except CameraRelayError as exc:
+        if exc.status_code == 404:
+            raise HTTPException(status_code=404, detail="No camera stream for this printer") from exc
+        raise HTTPException(status_code=502, detail="Camera relay is unavailable") from exc
+
+    headers = {"ETag": snapshot.etag, "Cache-Control": f"private, max-age={snapshot.max_age()}"}
+    if etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.content, media_type=snapshot.media_type, headers=headers)
@@ -0,0 +1,168 @@
+from datetime import datetime, UTC
+from pathlib import PurePath
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, col, select
+
+from app.db.engine import get_session
+from app.library.storage import (
+    StoredBlob,
+    UploadTooLargeError,
+    discard_blob,
+    is_valid_sha256,
+    object_path,
+    publish_blob,
+    remove_blob,
+    store_stream,
+)
+from app.library.threemf import ARCHIVE_ERRORS, read_3mf_metadata, read_member
+from app.models.library import LibraryFile, LibraryFileDelete, LibraryFileRead, LibraryUploadRead
+
+router = APIRouter(prefix="/library")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _get_library_file(session: Session, sha256: str) -> LibraryFile:
+    if not is_valid_sha256(sha256):
+        raise HTTPException(status_code=422, detail="sha256 must be 64 lowercase hex characters")
+    library_file = session.exec(select(LibraryFile).where(LibraryFile.sha256 == sha256)).first()
+    if not library_file:
+        raise HTTPException(status_code=404, detail="File not found")
+    return library_file
+
+
+def _register_blob(session: Session, blob: StoredBlob, filename: str) -> tuple[LibraryFile, bool]:
+    # Rows and blobs change together under the SQLite write lock: the INSERT
+    # here and the DELETE in remove_file are each held until the blob is moved
+    # into or out of the object store, so a concurrent remove of the same content
+    # cannot leave a row without its file.
+    existing = session.exec(
+        select(LibraryFile).where(LibraryFile.sha256 == blob.sha256, LibraryFile.filename == filename)
+    ).first()
+    if existing:
+        # Puts the object back if it went missing under an existing row.
+        publish_blob(blob)
+        return existing, False
+
+    library_file = LibraryFile(sha256=blob.sha256, filename=filename, size_bytes=blob.size_bytes)
+    if filename.lower().endswith(".3mf"):
+        metadata = read_3mf_metadata(blob.path)
+        if metadata is not None:
+            library_file.plate_count = metadata.plate_count
+            library_file.estimated_seconds = metadata.estimated_seconds
+            library_file.filament_used_g = metadata.filament_used_g
+            library_file.filament_used_m = metadata.filament_used_m
+            library_file.filament_types = metadata.filament_types
+            library_file.thumbnail_member = metadata.thumbnail_member
+            library_file.has_thumbnail = metadata.thumbnail_member is not None
+    library_file.updated_at = datetime.now(UTC)
+
+    try:
+        session.add(library_file)
+        session.flush()
+        publish_blob(blob)
+        session.commit()
+        session.refresh(library_file)
+    except IntegrityError:
+        # A concurrent upload of the same file under the same name won the insert.
+        session.rollback()
+        return (
+            session.exec(
+                select(LibraryFile).where(LibraryFile.sha256 == blob.sha256, LibraryFile.filename == filename)
+            ).one(),
+            False,
+        )
+    return library_file, True
+
+
+def _register_upload(session: Session, blob: StoredBlob, filename: str) -> tuple[LibraryFile, bool, bool]:
+    try:
+        content_stored = object_path(blob.sha256).exists()
+        library_file, created = _register_blob(session, blob, filename)
+        return library_file, created, content_stored
+    finally:
+        discard_blob(blob)
+
+
+@router.post("/upload", response_model=LibraryUploadRead, status_code=status.HTTP_201_CREATED)
+async def upload_file(
+    request: Request,
+    response: Response,
+    filename: str = Query(..., min_length=1),
+    session: Session = Depends(get_session),
+) -> dict[str, Any]:
+    safe_name = PurePath(filename).name
+    if not safe_name:
+        raise HTTPException(status_code=422, detail="Invalid filename")
+
+    try:
+        blob = await store_stream(request.stream())
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail="Upload exceeds library_max_upload_bytes") from exc
+
+    library_file, created, duplicate = await run_in_threadpool(_register_upload, session, blob, safe_name)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    # duplicate: the content was already stored, so this upload used no extra disk space.
+    return {**library_file.model_dump(), "duplicate": duplicate}
+
+
+@router.get("/list", response_model=list[LibraryFileRead])
+def list_files(
+    q: str | None = Query(None, description="Case-insensitive filename prefix"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+) -> list[LibraryFile]:
+    statement = select(LibraryFile)
+    if q:
+        # A prefix LIKE on the NOCASE column is answered from the filename index.
+        statement = statement.where(col(LibraryFile.filename).like(f"{_escape_like(q)}%", escape="\\"))
+    statement = statement.order_by(LibraryFile.created_at.desc(), LibraryFile.id.desc())  # type: ignore[attr-defined, union-attr]
+    return list(session.exec(statement.offset(offset).limit(limit)))
+
+
+@router.get("/view", response_model=LibraryFileRead)
+def view_file(sha256: str = Query(...), session: Session = Depends(get_session)) -> LibraryFile:
+    return _get_library_file(session, sha256)
+
+
+@router.get("/thumbnail")
+def view_thumbnail(sha256: str = Query(...), session: Session = Depends(get_session)) -> Response:
+    library_file = _get_library_file(session, sha256)
+    if not library_file.thumbnail_member:
+        raise HTTPException(status_code=404, detail="File has no thumbnail")
+    try:
+        image = read_member(object_path(library_file.sha256), library_file.thumbnail_member)
+    except (FileNotFoundError, KeyError, *ARCHIVE_ERRORS) as exc:
+        raise HTTPException(status_code=404, detail="Thumbnail is not available") from exc
+    return Response(
+        content=image,
+        media_type="image/png",
+        headers={"Cache-Control": "public, max-age=31536000, immutable", "ETag": f'"{library_file.sha256}"'},
+    )
+
+
+@router.delete("/remove")
+def remove_file(payload: LibraryFileDelete, session: Session = Depends(get_session)) -> dict[str, str]:
+    _get_library_file(session, payload.sha256)
+    statement = select(LibraryFile).where(LibraryFile.sha256 == payload.sha256)
+    if payload.filename is not None:
+        statement = statement.where(LibraryFile.filename == payload.filename)
+    entries = list(session.exec(statement))
+    if not entries:
+        raise HTTPException(status_code=404, detail="File not found")
+    for entry in entries:
+        session.delete(entry)
+    session.flush()
+    # The blob goes with the last entry that references it.
+    if session.exec(select(LibraryFile.id).where(LibraryFile.sha256 == payload.sha256)).first() is None:
+        remove_blob(payload.sha256)
+    session.commit()
+    return {"status": "deleted", "sha256": payload.sha256}
@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
+from app.api.federation import router as federation_router
 from app.api.handlers import router as handlers_router
+from app.api.library import router as library_router
 
 api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(handlers_router)
+api_router.include_router(library_router)
+api_router.include_router(federation_router)
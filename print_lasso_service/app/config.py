@@ -10,14 +10,39 @@ class Settings(BaseSettings):
     ssdp_multicast_host: str = "239.255.255.250"
     ssdp_multicast_port: int = 2021
     ssdp_timeout_seconds: float = 3.0
+    passive_discovery_enabled: bool = True
+    discovery_cache_ttl_seconds: float = 600.0
+    discovery_cache_flush_seconds: float = 2.0
+    discovery_sync_enabled: bool = True
+    passive_sync_enabled: bool = False
+    leader_lease_seconds: float = 15.0
     mdns_enabled: bool = True
     mdns_service_type: str = "_print-lasso._tcp.local."
     mdns_instance_name: str = "Print Lasso Service"
     mdns_api_path: str = "/api/v1"
     mdns_advertise_host: str = ""
+    mdns_browse_enabled: bool = True
+    mdns_browse_service_types: list[str] = [
+        "_octoprint._tcp.local.",
+        "_moonraker._tcp.local.",
+        "_prusa-link._tcp.local.",
+        "_print-lasso._tcp.local.",
+    ]
+    mdns_resolve_timeout_ms: int = 3000
     go2rtc_enabled: bool = True
     go2rtc_base_url: str = "http://127.0.0.1:1984"
     go2rtc_timeout_seconds: float = 2.0
+    snapshot_cache_ttl_seconds: float = 5.0
+    snapshot_cache_max_entries: int = 256
+    snapshot_cache_max_bytes: int = 64 * 1024 * 1024
+    federation_enabled: bool = False
+    federation_peers: list[str] = []
+    federation_discover_peers: bool = True
+    federation_timeout_seconds: float = 2.0
+    federation_cache_seconds: float = 5.0
+    federation_stale_seconds: float = 300.0
+    library_dir: str = "library"
+    library_max_upload_bytes: int = 1024 * 1024 * 1024
 
     @property
     def database_url(self) -> str:
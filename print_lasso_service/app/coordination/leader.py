@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.config import settings
+from app.db import engine as db_engine
+from app.models.coordination import Lease  # noqa: F401  (registers the leases table)
+
+logger = logging.getLogger("print_lasso")
+
+LEADER_LEASE_NAME = "leader"
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# The conditional upsert only takes the row over when this worker already
+# holds it or the previous holder stopped renewing before expires_at.
+_ACQUIRE_SQL = text(
+    """
+    INSERT INTO leases (name, holder, acquired_at, expires_at)
+    VALUES (:name, :holder, :now, :expires_at)
+    ON CONFLICT(name) DO UPDATE SET
+        holder = excluded.holder,
+        acquired_at = CASE
+            WHEN leases.holder = excluded.holder THEN leases.acquired_at
+            ELSE excluded.acquired_at
+        END,
+        expires_at = excluded.expires_at
+    WHERE leases.holder = excluded.holder OR leases.expires_at < :now
+    """
+)
+_HOLDER_SQL = text("SELECT holder FROM leases WHERE name = :name")
+_RELEASE_SQL = text("DELETE FROM leases WHERE name = :name AND holder = :holder")
+
+
+def try_acquire_lease(name: str, holder: str, ttl_seconds: float, now: float | None = None) -> bool:
+    now = time.time() if now is None else now
+    with Session(db_engine.engine) as session:
+        session.execute(_ACQUIRE_SQL, {"name": name, "holder": holder, "now": now, "expires_at": now + ttl_seconds})
+        current = session.execute(_HOLDER_SQL, {"name": name}).scalar_one_or_none()
+        session.commit()
+    return current == holder
+
+
+def release_lease(name: str, holder: str) -> None:
+    with Session(db_engine.engine) as session:
+        session.execute(_RELEASE_SQL, {"name": name, "holder": holder})
+        session.commit()
+
+
+@dataclass
+class LeaderDuty:
+    name: str
+    start: Callable[[], Awaitable[Any]]
+    stop: Callable[[], Awaitable[Any]]
+    # Read when the duty would start, so settings changed after import still apply.
+    enabled: Callable[[], bool] = lambda: True
+    status: str = "idle"
+    error: str | None = None
+
+
+class LeaderElector:
+    def __init__(self, name: str = LEADER_LEASE_NAME, holder: str = WORKER_ID) -> None:
+        self.name = name
+        self.holder = holder
+        self.is_leader = False
+        self._duties: list[LeaderDuty] = []
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def ttl_seconds(self) -> float:
+        return settings.leader_lease_seconds
+
+    def add_duty(self, duty: LeaderDuty) -> None:
+        self._duties.append(duty)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "worker_id": self.holder,
+            "role": "leader" if self.is_leader else "follower",
+            "duties": {duty.name: {"status": duty.status, "error": duty.error} for duty in self._duties},
+        }
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        await self.tick()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.is_leader:
+            await self._stop_duties()
+            # Releasing instead of waiting for expiry lets another worker take over immediately.
+            try:
+                await asyncio.to_thread(release_lease, self.name, self.holder)
+            except Exception:
+                logger.exception("Failed to release leader lease")
+            self.is_leader = False
+
+    async def tick(self) -> None:
+        try:
+            acquired = await asyncio.to_thread(try_acquire_lease, self.name, self.holder, self.ttl_seconds)
+        except Exception:
+            # A worker that cannot renew must assume its lease is lost.
+            logger.exception("Leader lease renewal failed")
+            acquired = False
+
+        if acquired and not self.is_leader:
+            self.is_leader = True
+            logger.info("Worker %s elected leader", self.holder)
+            await self._start_duties()
+        elif not acquired and self.is_leader:
+            self.is_leader = False
+            logger.warning("Worker %s lost leadership", self.holder)
+            await self._stop_duties()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl_seconds / 3)
+            await self.tick()
+
+    async def _start_duties(self) -> None:
+        for duty in self._duties:
+            if not duty.enabled():
+                duty.status, duty.error = "disabled", None
+                continue
+            try:
+                await duty.start()
+                duty.status, duty.error = "running", None
+            except Exception as exc:
+                duty.status, duty.error = "failed", str(exc) or type(exc).__name__
+                logger.exception("Leader duty %s failed to start", duty.name)
+
+    async def _stop_duties(self) -> None:
+        for duty in reversed(self._duties):
+            if duty.status != "running":
+                if duty.status != "disabled":
+                    duty.status = "idle"
+                continue
+            try:
+                await duty.stop()
+            except Exception:
+                logger.exception("Leader duty %s failed to stop cleanly", duty.name)
+            duty.status, duty.error = "idle", None
+
+
+class PeriodicJob:
+    def __init__(self, name: str, interval_seconds: float, job: Callable[[], Awaitable[Any]]) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self._job = job
+        self._task: asyncio.Task[None] | None = None
+
+    def as_duty(self) -> LeaderDuty:
+        return LeaderDuty(name=self.name, start=self.start, stop=self.stop)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._job()
+            except Exception:
+                logger.exception("Periodic job %s failed", self.name)
+            await asyncio.sleep(self.interval_seconds)
+
+
+leader_elector = LeaderElector()
@@ -1,5 +1,8 @@
-from typing import Generator
+import sqlite3
+from typing import Any, Generator
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlmodel import Session, create_engine
 
 from app.config import settings
@@ -7,6 +10,18 @@ from app.config import settings
 engine = create_engine(settings.database_url, echo=False, connect_args={"check_same_thread": False})
 
 
+@event.listens_for(Engine, "connect")
+def _configure_sqlite(dbapi_connection: Any, _: Any) -> None:
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    # Several uvicorn workers share one database file: WAL lets readers proceed
+    # while another worker writes, and busy_timeout waits out short write locks.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
 def get_session() -> Generator[Session, None, None]:
     with Session(engine) as session:
         yield session
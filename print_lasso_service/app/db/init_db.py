@@ -1,7 +1,44 @@
+import time
+
+from sqlalchemy import Connection, inspect
+from sqlalchemy.exc import OperationalError
 from sqlmodel import SQLModel
 
-from app.db.engine import engine
+from app.db import engine as db_engine
+
+_CREATE_ATTEMPTS = 5
+
+
+def _add_missing_columns(connection: Connection) -> None:
+    # create_all never alters existing tables, so nullable columns added to a
+    # model after a database was created are appended here.
+    inspector = inspect(connection)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            try:
+                connection.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+            except OperationalError as exc:
+                if "duplicate column" not in str(exc):
+                    raise
 
 
 def create_db_and_tables() -> None:
-    SQLModel.metadata.create_all(engine)
+    for attempt in range(_CREATE_ATTEMPTS):
+        try:
+            SQLModel.metadata.create_all(db_engine.engine)
+            break
+        except OperationalError as exc:
+            # Another worker created a table between our existence check and
+            # CREATE TABLE. It may still be working through the remaining
+            # tables, so back off briefly and let the next pass skip what exists.
+            if "already exists" not in str(exc) or attempt == _CREATE_ATTEMPTS - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+    with db_engine.engine.begin() as connection:
+        _add_missing_columns(connection)
@@ -0,0 +1,105 @@
+import json
+import time
+from typing import Any, Dict, Iterable, List
+
+from sqlmodel import Session, col, delete, select
+
+from app.db import engine as db_engine
+from app.models.discovery import DiscoveredPrinter, MdnsService
+
+_CACHED_FIELDS = (
+    "brand",
+    "name",
+    "model",
+    "ip_address",
+    "port",
+    "dev_version",
+    "dev_signal",
+    "dev_connect",
+    "st",
+    "location",
+    "server",
+)
+
+
+def record_discovered_printers(printers: Iterable[Dict[str, str]], source: str) -> int:
+    by_serial = {printer["serial_number"]: printer for printer in printers if printer.get("serial_number")}
+    if not by_serial:
+        return 0
+
+    now = time.time()
+    with Session(db_engine.engine) as session:
+        existing = {
+            row.serial_number: row
+            for row in session.exec(
+                select(DiscoveredPrinter).where(col(DiscoveredPrinter.serial_number).in_(list(by_serial)))
+            )
+        }
+        for serial_number, printer in by_serial.items():
+            row = existing.get(serial_number) or DiscoveredPrinter(serial_number=serial_number)
+            for field_name in _CACHED_FIELDS:
+                setattr(row, field_name, printer.get(field_name, "") or "")
+            row.source = source
+            row.last_seen_at = now
+            session.add(row)
+        session.commit()
+    return len(by_serial)
+
+
+def list_cached_printers(max_age_seconds: float | None = None) -> List[Dict[str, str]]:
+    statement = select(DiscoveredPrinter).order_by(DiscoveredPrinter.serial_number)
+    if max_age_seconds is not None:
+        statement = statement.where(DiscoveredPrinter.last_seen_at >= time.time() - max_age_seconds)
+    with Session(db_engine.engine) as session:
+        return [row.to_discovery_dict() for row in session.exec(statement)]
+
+
+def prune_discovery_cache(max_age_seconds: float) -> int:
+    with Session(db_engine.engine) as session:
+        result = session.exec(  # type: ignore[call-overload]
+            delete(DiscoveredPrinter).where(col(DiscoveredPrinter.last_seen_at) < time.time() - max_age_seconds)
+        )
+        session.commit()
+        return int(result.rowcount or 0)
+
+
+def record_mdns_service(
+    name: str,
+    service_type: str,
+    server: str,
+    addresses: Iterable[str],
+    port: int,
+    properties: Dict[str, Any],
+) -> None:
+    with Session(db_engine.engine) as session:
+        row = session.exec(select(MdnsService).where(MdnsService.name == name)).first() or MdnsService(
+            name=name, service_type=service_type
+        )
+        row.service_type = service_type
+        row.server = server
+        row.addresses = ",".join(addresses)
+        row.port = port
+        row.properties = json.dumps(properties, sort_keys=True)
+        row.last_seen_at = time.time()
+        session.add(row)
+        session.commit()
+
+
+def remove_mdns_service(name: str) -> None:
+    with Session(db_engine.engine) as session:
+        session.exec(delete(MdnsService).where(col(MdnsService.name) == name))  # type: ignore[call-overload]
+        session.commit()
+
+
+def clear_mdns_services() -> None:
+    with Session(db_engine.engine) as session:
+        session.exec(delete(MdnsService))  # type: ignore[call-overload]
+        session.commit()
+
+
+def list_cached_mdns_services(service_type: str | None = None) -> List[Dict[str, Any]]:
+    statement = select(MdnsService).order_by(MdnsService.service_type, MdnsService.name)
+    if service_type:
+        statement = statement.where(MdnsService.service_type == service_type)
+    with Session(db_engine.engine) as session:
+        return [row.to_discovery_dict() for row in session.exec(statement)]
@@ -1,15 +1,19 @@
+import asyncio
 import logging
 import socket
-
-from zeroconf import IPVersion, ServiceInfo
-from zeroconf.asyncio import AsyncZeroconf
+from typing import TYPE_CHECKING
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    from zeroconf import ServiceInfo
+    from zeroconf.asyncio import AsyncZeroconf
+
 logger = logging.getLogger("print_lasso")
 
-_zeroconf: AsyncZeroconf | None = None
-_service_info: ServiceInfo | None = None
+_zeroconf: "AsyncZeroconf | None" = None
+_zeroconf_owners: set[str] = set()
+_service_info: "ServiceInfo | None" = None
 
 
 def _resolve_advertise_ip() -> str:
@@ -27,13 +31,44 @@ def _resolve_advertise_ip() -> str:
         return "127.0.0.1"
 
 
-async def register_mdns_service() -> None:
-    global _zeroconf, _service_info
+def advertised_service_name() -> str | None:
+    return _service_info.name if _service_info is not None else None
+
+
+def acquire_zeroconf(owner: str) -> "AsyncZeroconf":
+    # Advertising and browsing share one AsyncZeroconf (one set of multicast
+    # sockets and one record cache); it is closed when its last owner releases it.
+    global _zeroconf
+
+    if _zeroconf is None:
+        from zeroconf import IPVersion
+        from zeroconf.asyncio import AsyncZeroconf
+
+        _zeroconf = AsyncZeroconf(ip_version=IPVersion.V4Only)
+    _zeroconf_owners.add(owner)
+    return _zeroconf
 
-    if not settings.mdns_enabled or _zeroconf is not None:
-        return
 
-    advertise_ip = _resolve_advertise_ip()
+async def release_zeroconf(owner: str) -> None:
+    global _zeroconf
+
+    _zeroconf_owners.discard(owner)
+    if _zeroconf is not None and not _zeroconf_owners:
+        zeroconf, _zeroconf = _zeroconf, None
+        await zeroconf.async_close()
+
+
+async def register_mdns_service() -> bool:
+    global _service_info
+
+    if not settings.mdns_enabled or _service_info is not None:
+        return _service_info is not None
+
+    # zeroconf is imported here, and the route lookup runs in a thread, so
+    # neither blocks the event loop while the service is starting.
+    from zeroconf import ServiceInfo
+
+    advertise_ip = await asyncio.to_thread(_resolve_advertise_ip)
     service_type = settings.mdns_service_type
     service_name = f"{settings.mdns_instance_name}.{service_type}"
 
@@ -50,28 +85,27 @@ async def register_mdns_service() -> None:
     )
 
     try:
-        zeroconf = AsyncZeroconf(ip_version=IPVersion.V4Only)
+        zeroconf = acquire_zeroconf("advertiser")
         await zeroconf.async_register_service(info, allow_name_change=True)
-        _zeroconf = zeroconf
         _service_info = info
         logger.info("mDNS service advertised: %s at %s:%s", info.name, advertise_ip, settings.port)
+        return True
     except Exception:
         logger.exception("Failed to register mDNS service")
-        await unregister_mdns_service()
+        await release_zeroconf("advertiser")
+        return False
 
 
 async def unregister_mdns_service() -> None:
-    global _zeroconf, _service_info
+    global _service_info
 
-    if _zeroconf is None:
+    if _zeroconf is None or _service_info is None:
         return
 
     try:
-        if _service_info is not None:
-            await _zeroconf.async_unregister_service(_service_info)
+        await _zeroconf.async_unregister_service(_service_info)
     except Exception:
         logger.exception("Failed to unregister mDNS service cleanly")
     finally:
-        await _zeroconf.async_close()
-        _zeroconf = None
         _service_info = None
+        await release_zeroconf("advertiser")
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Iterable
+
+from app.config import settings
+from app.discovery.cache import clear_mdns_services, record_mdns_service, remove_mdns_service
+from app.discovery.mdns import acquire_zeroconf, advertised_service_name, release_zeroconf
+
+if TYPE_CHECKING:
+    from zeroconf import ServiceStateChange, Zeroconf
+    from zeroconf.asyncio import AsyncServiceBrowser, AsyncZeroconf
+
+logger = logging.getLogger("print_lasso")
+_BROWSER_OWNER = "browser"
+
+
+def _decode_properties(properties: Dict[bytes, bytes | None]) -> Dict[str, str | None]:
+    return {
+        key.decode("utf-8", errors="replace"): None if value is None else value.decode("utf-8", errors="replace")
+        for key, value in properties.items()
+    }
+
+
+class MdnsBrowser:
+    # Keeps the mdns_services table in step with the network: each add, update or
+    # removal event changes one row, so discover requests read it without waiting.
+    def __init__(self, service_types: Iterable[str] | None = None) -> None:
+        self._service_types = list(service_types) if service_types is not None else None
+        self._zeroconf: "AsyncZeroconf | None" = None
+        self._browser: "AsyncServiceBrowser | None" = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        # Each add/update event gets a generation per service name; a resolve that
+        # finishes after a newer event or a removal is dropped instead of re-inserting
+        # the row. Writes are serialised so the check and the write cannot interleave.
+        self._generations: dict[str, int] = {}
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def service_types(self) -> list[str]:
+        if self._service_types is not None:
+            return self._service_types
+        return list(settings.mdns_browse_service_types)
+
+    async def start(self) -> None:
+        if self._browser is not None or not self.service_types:
+            return
+        from zeroconf.asyncio import AsyncServiceBrowser
+
+        # A new leader rebuilds the table from scratch; the browser replays every
+        # service that is currently on the network as an add event.
+        await asyncio.to_thread(clear_mdns_services)
+        self._zeroconf = acquire_zeroconf(_BROWSER_OWNER)
+        self._browser = AsyncServiceBrowser(
+            self._zeroconf.zeroconf,
+            self.service_types,
+            handlers=[self._on_state_change],
+        )
+        logger.info("mDNS browser watching %s", self.service_types)
+
+    async def stop(self) -> None:
+        if self._browser is not None:
+            await self._browser.async_cancel()
+            self._browser = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._generations.clear()
+        if self._zeroconf is not None:
+            self._zeroconf = None
+            await release_zeroconf(_BROWSER_OWNER)
+
+    def _on_state_change(
+        self,
+        zeroconf: "Zeroconf",
+        service_type: str,
+        name: str,
+        state_change: "ServiceStateChange",
+    ) -> None:
+        from zeroconf import ServiceStateChange
+
+        if state_change is ServiceStateChange.Removed:
+            handler = self.apply_removed(name)
+        else:
+            handler = self._resolve_and_apply(service_type, name, self._next_generation(name))
+        task = asyncio.ensure_future(handler)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _next_generation(self, name: str) -> int:
+        generation = self._generations.get(name, 0) + 1
+        self._generations[name] = generation
+        return generation
+
+    async def _resolve_and_apply(self, service_type: str, name: str, generation: int) -> None:
+        from zeroconf.asyncio import AsyncServiceInfo
+
+        if self._zeroconf is None:
+            return
+        info = AsyncServiceInfo(service_type, name)
+        if not await info.async_request(self._zeroconf.zeroconf, settings.mdns_resolve_timeout_ms):
+            logger.debug("mDNS service %s did not resolve", name)
+            return
+        await self.apply_resolved(
+            {
+                "name": name,
+                "service_type": service_type,
+                "server": info.server or "",
+                "addresses": info.parsed_addresses(),
+                "port": info.port or 0,
+                "properties": _decode_properties(info.properties),
+            },
+            generation=generation,
+        )
+
+    async def apply_resolved(self, service: Dict[str, Any], generation: int | None = None) -> None:
+        if service["name"] == advertised_service_name():
+            return
+        async with self._write_lock:
+            if generation is not None and self._generations.get(service["name"]) != generation:
+                logger.debug("Dropping stale mDNS resolve for %s", service["name"])
+                return
+            try:
+                await asyncio.to_thread(record_mdns_service, **service)
+            except Exception:
+                logger.exception("Failed to cache mDNS service %s", service["name"])
+
+    async def apply_removed(self, name: str) -> None:
+        async with self._write_lock:
+            self._generations.pop(name, None)
+            try:
+                await asyncio.to_thread(remove_mdns_service, name)
+            except Exception:
+                logger.exception("Failed to drop mDNS service %s", name)
+
+
+mdns_browser = MdnsBrowser()
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List
+
+from app.config import settings
+from app.discovery.cache import record_discovered_printers
+from app.discovery.ssdp import BAMBU_PORTS, _open_multicast_listener, _parse_bambu_response, parse_ssdp_response
+from app.discovery.sync import sync_discovered_printers
+
+logger = logging.getLogger("print_lasso")
+
+
+class _SSDPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, listener: "PassiveDiscovery") -> None:
+        self._listener = listener
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        self._listener.handle_packet(data, addr)
+
+
+class PassiveDiscovery:
+    # Bambu printers periodically NOTIFY on the SSDP ports; collecting those keeps
+    # the shared discovery cache fresh without sending any probes.
+    def __init__(self, ports: Iterable[int] = BAMBU_PORTS) -> None:
+        self.ports = tuple(ports)
+        self._pending: Dict[str, Dict[str, str]] = {}
+        # Serials whose latest NOTIFY came from the address it advertised.
+        self._verified: set[str] = set()
+        self._transports: List[asyncio.DatagramTransport] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self.packets_received = 0
+
+    @property
+    def running(self) -> bool:
+        return self._flush_task is not None
+
+    def handle_packet(self, data: bytes, addr: tuple[str, int]) -> None:
+        self.packets_received += 1
+        if data.lstrip().upper().startswith(b"M-SEARCH"):
+            return
+        parsed = _parse_bambu_response(parse_ssdp_response(data, addr), addr[0])
+        if parsed:
+            # Later packets from the same printer replace earlier ones until the next flush.
+            self._pending[parsed["serial_number"]] = parsed
+            if parsed["ip_address"] == addr[0]:
+                self._verified.add(parsed["serial_number"])
+            else:
+                self._verified.discard(parsed["serial_number"])
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        for port in self.ports:
+            try:
+                sock = _open_multicast_listener(port)
+            except OSError as exc:
+                logger.warning("Passive SSDP listener could not bind port %s: %s", port, exc)
+                continue
+            sock.setblocking(False)
+            transport, _ = await loop.create_datagram_endpoint(lambda: _SSDPProtocol(self), sock=sock)
+            self._transports.append(transport)
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("Passive SSDP discovery listening on %s", [port for port in self.ports])
+
+    async def stop(self) -> None:
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> List[Dict[str, str]]:
+        if not self._pending:
+            return []
+        batch = list(self._pending.values())
+        verified = [printer for printer in batch if printer["serial_number"] in self._verified]
+        self._pending, self._verified = {}, set()
+        await asyncio.to_thread(record_discovered_printers, batch, "passive")
+        # NOTIFY packets are unauthenticated and a registered printer's camera URL
+        # carries its access code, so applying them to printers is opt-in, and only
+        # packets sent from the address they advertise are trusted.
+        if settings.passive_sync_enabled and verified:
+            await asyncio.to_thread(sync_discovered_printers, verified, "passive")
+        return batch
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.discovery_cache_flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush passive discovery results")
+
+
+passive_discovery = PassiveDiscovery()
@@ -123,24 +123,36 @@ def _open_multicast_listener(port: int) -> socket.socket:
     return sock
 
 
-def _send_probes(sock: socket.socket, search_targets: Iterable[str]) -> None:
-    destinations = (MULTICAST_GROUP, "255.255.255.255")
-    for destination_host in destinations:
-        for destination_port in BAMBU_PORTS:
-            for search_target in search_targets:
-                payload = build_msearch_payload(destination_port, st=search_target)
-                with suppress(OSError):
-                    sock.sendto(payload, (destination_host, destination_port))
-
-
-def _discover_on_socket(timeout_seconds: float, include_all: bool) -> List[Dict[str, str]]:
+def _default_probe_destinations() -> List[tuple[str, int]]:
+    return [(host, port) for host in (MULTICAST_GROUP, "255.255.255.255") for port in BAMBU_PORTS]
+
+
+def _send_probes(
+    sock: socket.socket,
+    search_targets: Iterable[str],
+    destinations: Iterable[tuple[str, int]] | None = None,
+) -> None:
+    for destination_host, destination_port in destinations or _default_probe_destinations():
+        for search_target in search_targets:
+            payload = build_msearch_payload(destination_port, st=search_target)
+            with suppress(OSError):
+                sock.sendto(payload, (destination_host, destination_port))
+
+
+def _discover_on_socket(
+    timeout_seconds: float,
+    include_all: bool,
+    *,
+    probe_destinations: Iterable[tuple[str, int]] | None = None,
+    listen_ports: Iterable[int] = BAMBU_PORTS,
+) -> List[Dict[str, str]]:
     printers: Dict[str, Dict[str, str]] = {}
     first_result_at: float | None = None
     last_result_at: float | None = None
     passive_listeners: List[socket.socket] = []
     with _open_discovery_socket() as sock:
         listener_sockets: List[socket.socket] = [sock]
-        for listen_port in BAMBU_PORTS:
+        for listen_port in listen_ports:
             try:
                 passive_sock = _open_multicast_listener(listen_port)
             except OSError:
@@ -149,7 +161,7 @@ def _discover_on_socket(timeout_seconds: float, include_all: bool) -> List[Dict[
             listener_sockets.append(passive_sock)
 
         # First pass: exact Bambu ST, second pass: broad SSDP search.
-        _send_probes(sock, (BAMBU_ST, BAMBU_ST_FALLBACK))
+        _send_probes(sock, (BAMBU_ST, BAMBU_ST_FALLBACK), probe_destinations)
         deadline = time.monotonic() + timeout_seconds
 
         try:
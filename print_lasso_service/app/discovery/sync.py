@@ -0,0 +1,95 @@
+import logging
+from datetime import datetime, UTC
+from typing import Any, Dict, Iterable, List
+from urllib.parse import urlsplit, urlunsplit
+
+from sqlmodel import Session, col, select
+
+from app.db import engine as db_engine
+from app.integrations.go2rtc import move_camera_streams
+from app.integrations.snapshots import snapshot_cache
+from app.models.printer import Printer
+
+logger = logging.getLogger("print_lasso")
+
+# Registered printer field -> discovery result key. Names are user-chosen labels
+# and are never overwritten from discovery.
+_SYNCED_FIELDS = (
+    ("ip_address", "ip_address"),
+    ("model", "model"),
+    ("firmware_version", "dev_version"),
+)
+
+
+def _replace_host(url: str | None, old_host: str | None, new_host: str) -> str | None:
+    if not url or not old_host:
+        return url
+    parts = urlsplit(url)
+    if parts.hostname != old_host:
+        return url
+    userinfo, _, _ = parts.netloc.rpartition("@")
+    host = f"[{new_host}]" if ":" in new_host else new_host
+    netloc = host if parts.port is None else f"{host}:{parts.port}"
+    if userinfo:
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit(parts._replace(netloc=netloc))
+
+
+def _diff(printer: Printer, discovered: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    changes: Dict[str, Dict[str, Any]] = {}
+    for field_name, key in _SYNCED_FIELDS:
+        value = discovered.get(key) or ""
+        # Blank values in a discovery packet mean "not reported", not "cleared".
+        if value and value != getattr(printer, field_name):
+            changes[field_name] = {"old": getattr(printer, field_name), "new": value}
+
+    if "ip_address" in changes:
+        camera_url = _replace_host(printer.camera_url, changes["ip_address"]["old"], changes["ip_address"]["new"])
+        if camera_url != printer.camera_url:
+            changes["camera_url"] = {"old": printer.camera_url, "new": camera_url}
+    return changes
+
+
+def sync_discovered_printers(printers: Iterable[Dict[str, str]], source: str) -> Dict[str, Any]:
+    # Diffs discovery results against registered printers by serial number and
+    # applies every change in one transaction, then moves go2rtc streams in one batch.
+    by_serial = {printer["serial_number"]: printer for printer in printers if printer.get("serial_number")}
+    report: Dict[str, Any] = {
+        "source": source,
+        "checked": len(by_serial),
+        "matched": 0,
+        "updated": 0,
+        "changes": [],
+        "streams": {"updated": 0, "failed": 0},
+    }
+    if not by_serial:
+        return report
+
+    changes: List[Dict[str, Any]] = []
+    stream_moves: List[tuple[str, str | None, str | None]] = []
+    with Session(db_engine.engine) as session:
+        registered = list(session.exec(select(Printer).where(col(Printer.serial_number).in_(list(by_serial)))))
+        report["matched"] = len(registered)
+        now = datetime.now(UTC)
+        for printer in registered:
+            diff = _diff(printer, by_serial[printer.serial_number])
+            if not diff:
+                continue
+            for field_name, change in diff.items():
+                setattr(printer, field_name, change["new"])
+            printer.updated_at = now
+            session.add(printer)
+            changes.append({"serial_number": printer.serial_number, "name": printer.name, "changes": diff})
+            if "camera_url" in diff:
+                stream_moves.append((printer.serial_number, diff["camera_url"]["old"], diff["camera_url"]["new"]))
+        if changes:
+            session.commit()
+
+    for serial_number, _, _ in stream_moves:
+        snapshot_cache.invalidate(serial_number)
+    report["streams"] = move_camera_streams(stream_moves)
+    report["updated"] = len(changes)
+    report["changes"] = sorted(changes, key=lambda change: change["serial_number"])
+    if changes:
+        logger.info("Synced %d printer(s) from %s discovery", len(changes), source)
+    return report
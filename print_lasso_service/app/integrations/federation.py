@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List
+
+from app.config import settings
+from app.discovery.cache import list_cached_mdns_services
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger("print_lasso")
+
+LOCAL_SITE = "local"
+SITE_OK = "ok"
+SITE_CACHED = "cached"
+SITE_STALE = "stale"
+SITE_UNAVAILABLE = "unavailable"
+# Lower ranks win when several sites report the same serial number.
+_SITE_RANK = {SITE_OK: 0, SITE_CACHED: 1, SITE_STALE: 2}
+
+
+@dataclass
+class _CachedResponse:
+    data: Any
+    fetched_at: float
+
+
+@dataclass
+class SiteResult:
+    site: str
+    status: str
+    data: List[Dict[str, Any]]
+    age_seconds: float = 0.0
+    error: str | None = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "site": self.site,
+            "status": self.status,
+            "count": len(self.data),
+            "age_seconds": round(self.age_seconds, 2),
+            "error": self.error,
+        }
+
+
+def discovered_peer_urls() -> List[str]:
+    urls: List[str] = []
+    for service in list_cached_mdns_services(service_type=settings.mdns_service_type):
+        if not service["addresses"] or not service["port"]:
+            continue
+        api_path = (service["properties"].get("api_path") or settings.mdns_api_path).rstrip("/")
+        urls.append(f"http://{service['addresses'][0]}:{service['port']}{api_path}")
+    return urls
+
+
+class FederationClient:
+    def __init__(self, transport: "httpx.AsyncBaseTransport | None" = None) -> None:
+        self._transport = transport
+        self._client: "httpx.AsyncClient | None" = None
+        self._cache: Dict[tuple[str, str], _CachedResponse] = {}
+        self._inflight: Dict[tuple[str, str], asyncio.Task[Any]] = {}
+
+    def _http(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            # One pooled client keeps connections to every peer warm between requests.
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=settings.federation_timeout_seconds,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def peer_urls(self) -> List[str]:
+        urls = [url.rstrip("/") for url in settings.federation_peers]
+        if settings.federation_discover_peers:
+            urls.extend(await asyncio.to_thread(discovered_peer_urls))
+        return list(dict.fromkeys(urls))
+
+    async def fan_out(
+        self,
+        peers: Iterable[str],
+        method: str,
+        path: str,
+        *,
+        params: Dict[str, Any] | None = None,
+        extract: str | None = None,
+    ) -> List[SiteResult]:
+        return list(
+            await asyncio.gather(
+                *(self._fetch_site(peer, method, path, params or {}, extract) for peer in peers)
+            )
+        )
+
+    async def _fetch_site(
+        self,
+        peer: str,
+        method: str,
+        path: str,
+        params: Dict[str, Any],
+        extract: str | None,
+    ) -> SiteResult:
+        key = (peer, path)
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached.fetched_at < settings.federation_cache_seconds:
+            return SiteResult(peer, SITE_CACHED, cached.data, age_seconds=now - cached.fetched_at)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._request(peer, method, path, params, extract))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_request(key, done))
+
+        try:
+            # Shielded: a request that outlives the timeout keeps running and
+            # refreshes the cache for the next aggregate call.
+            data = await asyncio.wait_for(asyncio.shield(task), settings.federation_timeout_seconds)
+            return SiteResult(peer, SITE_OK, data)
+        except Exception as exc:
+            error = "timed out" if isinstance(exc, asyncio.TimeoutError) else str(exc) or type(exc).__name__
+            now = time.monotonic()
+            if cached is not None and now - cached.fetched_at <= settings.federation_stale_seconds:
+                return SiteResult(peer, SITE_STALE, cached.data, age_seconds=now - cached.fetched_at, error=error)
+            return SiteResult(peer, SITE_UNAVAILABLE, [], error=error)
+
+    async def _request(
+        self,
+        peer: str,
+        method: str,
+        path: str,
+        params: Dict[str, Any],
+        extract: str | None,
+    ) -> List[Dict[str, Any]]:
+        response = await self._http().request(method, f"{peer}{path}", params=params)
+        response.raise_for_status()
+        payload = response.json()
+        data = payload[extract] if extract else payload
+        if not isinstance(data, list):
+            raise ValueError(f"Unexpected response from {peer}{path}")
+        return data
+
+    def _finish_request(self, key: tuple[str, str], task: asyncio.Task[Any]) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.warning("Federation request to %s%s failed: %s", key[0], key[1], exc)
+            return
+        now = time.monotonic()
+        self._cache[key] = _CachedResponse(data=task.result(), fetched_at=now)
+        # Entries past the stale budget are never served again; dropping them keeps
+        # peers that mDNS no longer reports from accumulating.
+        for stale_key in [
+            cached_key
+            for cached_key, cached in self._cache.items()
+            if now - cached.fetched_at > settings.federation_stale_seconds
+        ]:
+            del self._cache[stale_key]
+
+
+def merge_by_serial(results: Iterable[SiteResult]) -> List[Dict[str, Any]]:
+    merged: Dict[str, tuple[int, Dict[str, Any]]] = {}
+    for result in results:
+        rank = _SITE_RANK.get(result.status)
+        if rank is None:
+            continue
+        for item in result.data:
+            serial_number = item.get("serial_number")
+            if not serial_number:
+                continue
+            current = merged.get(serial_number)
+            if current is None or rank < current[0]:
+                merged[serial_number] = (rank, {**item, "site": result.site})
+    items = [item for _, item in merged.values()]
+    return sorted(items, key=lambda item: (item.get("name") or "", item["serial_number"]))
+
+
+federation_client = FederationClient()
@@ -1,13 +1,22 @@
 import logging
 import re
+from typing import TYPE_CHECKING, Iterable
 from urllib.parse import urlparse
 
-import httpx
-
 from app.config import settings
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger("print_lasso")
 _VALID_ALIAS_CHARS = re.compile(r"[^a-z0-9_-]+")
+_async_client: "httpx.AsyncClient | None" = None
+
+
+class CameraRelayError(Exception):
+    def __init__(self, message: str, *, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
 
 
 def _is_rtsp_url(url: str | None) -> bool:
@@ -24,34 +33,65 @@ def _stream_alias_for_serial(serial_number: str) -> str:
     return f"printer-{normalized}"
 
 
-def _client() -> httpx.Client:
+def _client() -> "httpx.Client":
+    # httpx is imported on first use to keep it off the service startup path.
+    import httpx
+
     return httpx.Client(timeout=settings.go2rtc_timeout_seconds)
 
 
+def _shared_async_client() -> "httpx.AsyncClient":
+    global _async_client
+
+    if _async_client is None:
+        import httpx
+
+        _async_client = httpx.AsyncClient(timeout=settings.go2rtc_timeout_seconds)
+    return _async_client
+
+
+async def close_async_client() -> None:
+    global _async_client
+
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _put_stream(client: "httpx.Client", name: str, source_url: str) -> None:
+    response = client.put(
+        f"{settings.go2rtc_base_url.rstrip('/')}/api/streams",
+        params={"name": name, "src": source_url},
+    )
+    response.raise_for_status()
+
+
+def _drop_stream(client: "httpx.Client", name: str) -> None:
+    response = client.delete(
+        f"{settings.go2rtc_base_url.rstrip('/')}/api/streams",
+        params={"src": name},
+    )
+    # go2rtc may return 404 when stream doesn't exist; that is safe.
+    if response.status_code not in (200, 404):
+        response.raise_for_status()
+
+
 def _upsert_stream(name: str, source_url: str) -> None:
     with _client() as client:
-        response = client.put(
-            f"{settings.go2rtc_base_url.rstrip('/')}/api/streams",
-            params={"name": name, "src": source_url},
-        )
-        response.raise_for_status()
+        _put_stream(client, name, source_url)
 
 
 def _delete_stream(name: str) -> None:
     with _client() as client:
-        response = client.delete(
-            f"{settings.go2rtc_base_url.rstrip('/')}/api/streams",
-            params={"src": name},
-        )
-        # go2rtc may return 404 when stream doesn't exist; that is safe.
-        if response.status_code not in (200, 404):
-            response.raise_for_status()
+        _drop_stream(client, name)
 
 
 def ensure_camera_stream(serial_number: str, camera_url: str | None) -> None:
     if not settings.go2rtc_enabled or not _is_rtsp_url(camera_url):
         return
 
+    import httpx
+
     alias = _stream_alias_for_serial(serial_number)
     assert camera_url is not None  # guarded by _is_rtsp_url
     try:
@@ -68,6 +108,8 @@ def remove_camera_streams(serial_number: str, camera_url: str | None) -> None:
     if not settings.go2rtc_enabled:
         return
 
+    import httpx
+
     names: list[str] = [_stream_alias_for_serial(serial_number)]
     if _is_rtsp_url(camera_url) and camera_url is not None:
         names.append(camera_url)
@@ -77,3 +119,49 @@ def remove_camera_streams(serial_number: str, camera_url: str | None) -> None:
             _delete_stream(name)
         except httpx.HTTPError as exc:
             logger.warning("go2rtc stream delete failed for %s (%s): %s", serial_number, name, exc)
+
+
+def move_camera_streams(moves: Iterable[tuple[str, str | None, str | None]]) -> dict[str, int]:
+    # Each move is (serial_number, old_camera_url, new_camera_url). All of them go
+    # over one keep-alive connection instead of a client per request.
+    moves = list(moves)
+    counts = {"updated": 0, "failed": 0}
+    if not settings.go2rtc_enabled or not moves:
+        return counts
+
+    import httpx
+
+    with _client() as client:
+        for serial_number, old_camera_url, new_camera_url in moves:
+            try:
+                if _is_rtsp_url(old_camera_url) and old_camera_url != new_camera_url:
+                    assert old_camera_url is not None
+                    _drop_stream(client, old_camera_url)
+                if _is_rtsp_url(new_camera_url):
+                    assert new_camera_url is not None
+                    _put_stream(client, new_camera_url, new_camera_url)
+                    _put_stream(client, _stream_alias_for_serial(serial_number), new_camera_url)
+                else:
+                    _drop_stream(client, _stream_alias_for_serial(serial_number))
+            except httpx.HTTPError as exc:
+                logger.warning("go2rtc stream move failed for %s: %s", serial_number, exc)
+                counts["failed"] += 1
+                continue
+            counts["updated"] += 1
+    return counts
+
+
+async def fetch_frame(serial_number: str) -> tuple[bytes, str]:
+    import httpx
+
+    try:
+        response = await _shared_async_client().get(
+            f"{settings.go2rtc_base_url.rstrip('/')}/api/frame.jpeg",
+            params={"src": _stream_alias_for_serial(serial_number)},
+        )
+        response.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        raise CameraRelayError(str(exc), status_code=exc.response.status_code) from exc
+    except httpx.HTTPError as exc:
+        raise CameraRelayError(str(exc)) from exc
+    return response.content, response.headers.get("content-type", "image/jpeg")
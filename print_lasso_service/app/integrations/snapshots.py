@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from app.config import settings
+from app.integrations.go2rtc import fetch_frame
+
+FrameFetcher = Callable[[str], Awaitable[tuple[bytes, str]]]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    content: bytes
+    media_type: str
+    etag: str
+    expires_at: float
+
+    def max_age(self) -> int:
+        return max(0, int(self.expires_at - time.monotonic()))
+
+
+class SnapshotCache:
+    def __init__(
+        self,
+        fetch: FrameFetcher,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        max_bytes: int,
+    ) -> None:
+        self._fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, Snapshot] = OrderedDict()
+        self._total_bytes = 0
+        self._inflight: dict[str, asyncio.Task[Snapshot]] = {}
+        # The loop reads and fills the cache, but sync handlers and discovery sync
+        # invalidate it from worker threads; every state change happens under this lock.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def peek(self, key: str) -> Snapshot | None:
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is None:
+                return None
+            if snapshot.expires_at <= time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    async def get(self, key: str) -> Snapshot:
+        snapshot = self.peek(key)
+        if snapshot is not None:
+            return snapshot
+
+        # Every concurrent miss for the same key awaits a single upstream fetch.
+        with self._lock:
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(self._load(key))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so one disconnecting viewer does not cancel the fetch for the others.
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: str) -> None:
+        # Also detaches a fetch already in flight: it may carry a frame from the
+        # stream that was just replaced, so it is not stored and the next get refetches.
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    async def _load(self, key: str) -> Snapshot:
+        content, media_type = await self._fetch(key)
+        snapshot = Snapshot(
+            content=content,
+            media_type=media_type,
+            etag=f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"',
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        with self._lock:
+            if self._inflight.get(key) is asyncio.current_task():
+                self._store(key, snapshot)
+        return snapshot
+
+    def _forget(self, key: str, task: "asyncio.Task[Snapshot]") -> None:
+        with self._lock:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    # _discard and _store expect the caller to hold _lock.
+    def _discard(self, key: str) -> None:
+        snapshot = self._entries.pop(key, None)
+        if snapshot is not None:
+            self._total_bytes -= len(snapshot.content)
+
+    def _store(self, key: str, snapshot: Snapshot) -> None:
+        self._discard(key)
+        if len(snapshot.content) > self.max_bytes:
+            return
+        self._entries[key] = snapshot
+        self._total_bytes += len(snapshot.content)
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= len(evicted.content)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+snapshot_cache = SnapshotCache(
+    fetch_frame,
+    ttl_seconds=settings.snapshot_cache_ttl_seconds,
+    max_entries=settings.snapshot_cache_max_entries,
+    max_bytes=settings.snapshot_cache_max_bytes,
+)
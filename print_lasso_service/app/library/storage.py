@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, BinaryIO
+
+from app.config import settings
+
+_SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+_WRITE_BATCH_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+@dataclass
+class StoredBlob:
+    sha256: str
+    size_bytes: int
+    path: Path
+
+
+def is_valid_sha256(value: str) -> bool:
+    return bool(_SHA256_HEX.match(value))
+
+
+def library_root() -> Path:
+    return Path(settings.library_dir)
+
+
+def object_path(sha256: str) -> Path:
+    # Fan out by hash prefix so no single directory grows to thousands of entries.
+    return library_root() / "objects" / sha256[:2] / sha256
+
+
+def ensure_library_dirs() -> None:
+    for name in ("objects", "tmp"):
+        (library_root() / name).mkdir(parents=True, exist_ok=True)
+
+
+def _open_temp_file() -> tuple[BinaryIO, Path]:
+    tmp_dir = library_root() / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir)
+    return os.fdopen(fd, "wb"), Path(tmp_name)
+
+
+def _write_chunks(handle: BinaryIO, hasher: "hashlib._Hash", chunks: list[bytes]) -> None:
+    for chunk in chunks:
+        hasher.update(chunk)
+        handle.write(chunk)
+
+
+def publish_blob(blob: StoredBlob) -> None:
+    target = object_path(blob.sha256)
+    if target.exists():
+        # Same content is already stored; the upload costs no extra disk space.
+        blob.path.unlink(missing_ok=True)
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(blob.path, target)
+    blob.path = target
+
+
+def discard_blob(blob: StoredBlob) -> None:
+    # No-op once published: the temp file has been renamed or removed by then.
+    if blob.path != object_path(blob.sha256):
+        blob.path.unlink(missing_ok=True)
+
+
+async def store_stream(chunks: AsyncIterable[bytes]) -> StoredBlob:
+    # The body is received on the event loop; hashing and disk writes run in a
+    # worker thread, one call per _WRITE_BATCH_BYTES of buffered chunks.
+    handle, tmp_path = await asyncio.to_thread(_open_temp_file)
+    hasher = hashlib.sha256()
+    size = 0
+    pending: list[bytes] = []
+    pending_size = 0
+    try:
+        with handle:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > settings.library_max_upload_bytes:
+                    raise UploadTooLargeError
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= _WRITE_BATCH_BYTES:
+                    await asyncio.to_thread(_write_chunks, handle, hasher, pending)
+                    pending, pending_size = [], 0
+            await asyncio.to_thread(_write_chunks, handle, hasher, pending)
+
+        # Left in tmp/ until the upload is registered; see publish_blob.
+        return StoredBlob(sha256=hasher.hexdigest(), size_bytes=size, path=tmp_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def remove_blob(sha256: str) -> None:
+    object_path(sha256).unlink(missing_ok=True)
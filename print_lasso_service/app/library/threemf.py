@@ -0,0 +1,140 @@
+import io
+import math
+import mmap
+import re
+import zipfile
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+from xml.etree import ElementTree
+
+SLICE_INFO_MEMBER = "Metadata/slice_info.config"
+THUMBNAIL_CANDIDATES = (
+    "Metadata/plate_1.png",
+    "Metadata/thumbnail.png",
+    "Metadata/plate_1_small.png",
+    "Thumbnails/thumbnail.png",
+)
+_PLATE_GCODE_MEMBER = re.compile(r"^Metadata/plate_\d+\.gcode$")
+# What zipfile raises for damaged, truncated, encrypted or unsupported archives.
+ARCHIVE_ERRORS = (
+    zipfile.BadZipFile,
+    zlib.error,
+    EOFError,
+    NotImplementedError,
+    RuntimeError,
+    ValueError,
+)
+
+
+@dataclass
+class ThreeMFMetadata:
+    plate_count: int | None = None
+    estimated_seconds: int | None = None
+    filament_used_g: float | None = None
+    filament_used_m: float | None = None
+    filament_types: str | None = None
+    thumbnail_member: str | None = None
+
+
+class _MappedFile(io.RawIOBase):
+    # zipfile needs a seekable file object; mmap only grew `seekable()` in 3.13.
+    def __init__(self, mapped: mmap.mmap) -> None:
+        self._mapped = mapped
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[no-untyped-def]
+        data = self._mapped.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+
+    def tell(self) -> int:
+        return self._mapped.tell()
+
+
+@contextmanager
+def open_archive(path: Path) -> Iterator[zipfile.ZipFile]:
+    # Memory-map the archive so only the central directory and the members we
+    # actually read are paged in, instead of unpacking the whole file.
+    with path.open("rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with zipfile.ZipFile(_MappedFile(mapped)) as archive:
+                yield archive
+
+
+def _to_float(value: str | None) -> float | None:
+    try:
+        number = float(value) if value else None
+    except ValueError:
+        return None
+    # "inf", "nan" and "1e400" parse as floats but are not usable quantities.
+    return number if number is not None and math.isfinite(number) else None
+
+
+def _parse_slice_info(data: bytes, metadata: ThreeMFMetadata) -> None:
+    root = ElementTree.fromstring(data)
+    plates = root.findall("plate")
+    if not plates:
+        return
+
+    estimated = 0
+    used_g = 0.0
+    used_m = 0.0
+    filament_types: list[str] = []
+    for plate in plates:
+        for item in plate.findall("metadata"):
+            if item.get("key") == "prediction":
+                estimated += int(_to_float(item.get("value")) or 0)
+        for filament in plate.findall("filament"):
+            used_g += _to_float(filament.get("used_g")) or 0.0
+            used_m += _to_float(filament.get("used_m")) or 0.0
+            filament_type = filament.get("type")
+            if filament_type and filament_type not in filament_types:
+                filament_types.append(filament_type)
+
+    metadata.plate_count = len(plates)
+    metadata.estimated_seconds = estimated or None
+    metadata.filament_used_g = round(used_g, 2) if used_g else None
+    metadata.filament_used_m = round(used_m, 2) if used_m else None
+    metadata.filament_types = ",".join(filament_types) or None
+
+
+def read_3mf_metadata(path: Path) -> ThreeMFMetadata | None:
+    if path.stat().st_size == 0:
+        return None
+
+    try:
+        with open_archive(path) as archive:
+            members = set(archive.namelist())
+            metadata = ThreeMFMetadata()
+            if SLICE_INFO_MEMBER in members:
+                try:
+                    _parse_slice_info(archive.read(SLICE_INFO_MEMBER), metadata)
+                except ElementTree.ParseError:
+                    pass
+            if metadata.plate_count is None:
+                plate_count = sum(1 for name in members if _PLATE_GCODE_MEMBER.match(name))
+                metadata.plate_count = plate_count or None
+            metadata.thumbnail_member = next(
+                (name for name in THUMBNAIL_CANDIDATES if name in members),
+                None,
+            )
+            return metadata
+    except ARCHIVE_ERRORS:
+        return None
+
+
+def read_member(path: Path, member: str) -> bytes:
+    with open_archive(path) as archive:
+        return archive.read(member)
@@ -1,11 +1,21 @@
+import asyncio
 import logging
 
 from fastapi import FastAPI
 
 from app.api.middleware import register_middleware
 from app.api.router import api_router
+from app.config import settings
+from app.coordination.leader import LeaderDuty, PeriodicJob, leader_elector
 from app.db.init_db import create_db_and_tables
+from app.discovery.cache import prune_discovery_cache
 from app.discovery.mdns import register_mdns_service, unregister_mdns_service
+from app.discovery.mdns_browser import mdns_browser
+from app.discovery.passive import passive_discovery
+from app.integrations.federation import federation_client
+from app.integrations.go2rtc import close_async_client
+from app.library.storage import ensure_library_dirs
+from app.startup import startup_tracker
 
 logging.basicConfig(level=logging.INFO)
 
@@ -14,12 +24,66 @@ register_middleware(app)
 app.include_router(api_router)
 
 
+async def _advertise_mdns() -> None:
+    if not await register_mdns_service():
+        raise RuntimeError("mDNS advertisement failed")
+
+
+async def _prune_discovery_cache() -> None:
+    await asyncio.to_thread(prune_discovery_cache, settings.discovery_cache_ttl_seconds)
+
+
+# Only the worker holding the leader lease runs these, so several uvicorn
+# workers neither advertise the service twice nor compete for SSDP traffic.
+leader_elector.add_duty(
+    LeaderDuty(
+        name="mdns",
+        start=_advertise_mdns,
+        stop=unregister_mdns_service,
+        enabled=lambda: settings.mdns_enabled,
+    )
+)
+leader_elector.add_duty(
+    LeaderDuty(
+        name="mdns_browser",
+        start=mdns_browser.start,
+        stop=mdns_browser.stop,
+        enabled=lambda: settings.mdns_browse_enabled,
+    )
+)
+leader_elector.add_duty(
+    LeaderDuty(
+        name="passive_discovery",
+        start=passive_discovery.start,
+        stop=passive_discovery.stop,
+        enabled=lambda: settings.passive_discovery_enabled,
+    )
+)
+leader_elector.add_duty(
+    PeriodicJob(
+        "discovery_cache_prune",
+        interval_seconds=max(60.0, settings.discovery_cache_ttl_seconds / 4),
+        job=_prune_discovery_cache,
+    ).as_duty()
+)
+
+
 @app.on_event("startup")
 async def on_startup() -> None:
-    create_db_and_tables()
-    await register_mdns_service()
+    startup_tracker.reset()
+    startup_tracker.expect("coordination", required=False)
+    await asyncio.gather(
+        startup_tracker.run("database", asyncio.to_thread(create_db_and_tables)),
+        startup_tracker.run("library", asyncio.to_thread(ensure_library_dirs)),
+    )
+    # Leader duties (mDNS probing in particular) take a few seconds and nothing
+    # depends on them, so the election finishes in the background; /ready reports it.
+    startup_tracker.run_in_background("coordination", leader_elector.start())
 
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
-    await unregister_mdns_service()
+    await startup_tracker.cancel_background()
+    await leader_elector.stop()
+    await close_async_client()
+    await federation_client.close()
@@ -0,0 +1,11 @@
+from sqlmodel import Field, SQLModel
+
+
+class Lease(SQLModel, table=True):
+    __tablename__ = "leases"
+
+    name: str = Field(primary_key=True)
+    holder: str = Field(nullable=False)
+    # Unix timestamps: every worker process compares against the same wall clock.
+    acquired_at: float = Field(nullable=False)
+    expires_at: float = Field(nullable=False)
@@ -0,0 +1,64 @@
+import json
+from typing import Any, Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class DiscoveredPrinter(SQLModel, table=True):
+    __tablename__ = "discovered_printers"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    serial_number: str = Field(unique=True, nullable=False)
+    brand: str = ""
+    name: str = ""
+    model: str = ""
+    ip_address: str = Field(default="", index=True)
+    port: str = ""
+    dev_version: str = ""
+    dev_signal: str = ""
+    dev_connect: str = ""
+    st: str = ""
+    location: str = ""
+    server: str = ""
+    source: str = ""
+    last_seen_at: float = Field(default=0.0, index=True)
+
+    def to_discovery_dict(self) -> dict[str, str]:
+        return {
+            "brand": self.brand,
+            "serial_number": self.serial_number,
+            "name": self.name,
+            "model": self.model,
+            "ip_address": self.ip_address,
+            "port": self.port,
+            "dev_version": self.dev_version,
+            "dev_signal": self.dev_signal,
+            "dev_connect": self.dev_connect,
+            "st": self.st,
+            "location": self.location,
+            "server": self.server,
+        }
+
+
+class MdnsService(SQLModel, table=True):
+    __tablename__ = "mdns_services"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(unique=True, nullable=False)
+    service_type: str = Field(index=True, nullable=False)
+    server: str = ""
+    # Comma-separated resolved addresses and a JSON object of TXT properties.
+    addresses: str = ""
+    port: int = 0
+    properties: str = "{}"
+    last_seen_at: float = Field(default=0.0, index=True)
+
+    def to_discovery_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "service_type": self.service_type,
+            "server": self.server,
+            "addresses": [address for address in self.addresses.split(",") if address],
+            "port": self.port,
+            "properties": json.loads(self.properties or "{}"),
+        }
@@ -0,0 +1,49 @@
+from datetime import datetime, UTC
+from typing import Optional
+
+from sqlalchemy import String, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class LibraryFileBase(SQLModel):
+    sha256: str = Field(index=True)
+    filename: str
+    size_bytes: int = 0
+    plate_count: Optional[int] = None
+    estimated_seconds: Optional[int] = None
+    filament_used_g: Optional[float] = None
+    filament_used_m: Optional[float] = None
+    filament_types: Optional[str] = None
+    has_thumbnail: bool = False
+
+
+class LibraryFile(LibraryFileBase, table=True):
+    __tablename__ = "library_files"
+    # One catalog entry per name a file was uploaded under; entries with the
+    # same content share one blob in the object store.
+    __table_args__ = (UniqueConstraint("sha256", "filename"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    sha256: str = Field(index=True, nullable=False, max_length=64)
+    # NOCASE lets the index serve case-insensitive prefix searches.
+    filename: str = Field(index=True, nullable=False, sa_type=String(collation="NOCASE"))
+    # Zip member name of the preview image; read on demand, never copied out.
+    thumbnail_member: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), index=True)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class LibraryFileDelete(SQLModel):
+    sha256: str
+    # Removes only this entry; without it every entry for the content is removed.
+    filename: Optional[str] = None
+
+
+class LibraryFileRead(LibraryFileBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class LibraryUploadRead(LibraryFileRead):
+    duplicate: bool = False
@@ -11,6 +11,7 @@ class PrinterBase(SQLModel):
     ip_address: Optional[str] = None
     port: int = 0
     camera_url: Optional[str] = None
+    firmware_version: Optional[str] = None
 
 
 class Printer(PrinterBase, table=True):
@@ -35,6 +36,7 @@ class PrinterUpdate(SQLModel):
     ip_address: Optional[str] = None
     port: Optional[int] = None
     camera_url: Optional[str] = None
+    firmware_version: Optional[str] = None
 
 
 class PrinterDelete(SQLModel):
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable
+
+logger = logging.getLogger("print_lasso")
+
+PHASE_PENDING = "pending"
+PHASE_RUNNING = "running"
+PHASE_READY = "ready"
+PHASE_FAILED = "failed"
+
+
+@dataclass
+class StartupPhase:
+    name: str
+    required: bool
+    status: str = PHASE_PENDING
+    duration_ms: float | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "required": self.required,
+            "duration_ms": None if self.duration_ms is None else round(self.duration_ms, 2),
+            "error": self.error,
+        }
+
+
+class StartupTracker:
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._phases: dict[str, StartupPhase] = {}
+        self._background: set[asyncio.Task[None]] = set()
+        self._started_at = time.perf_counter()
+        self._finished_ms: float | None = None
+
+    def expect(self, name: str, *, required: bool = True) -> None:
+        # Registers a phase that starts later so the timing report waits for it.
+        self._phases[name] = StartupPhase(name=name, required=required)
+
+    async def run(self, name: str, awaitable: Awaitable[Any], *, required: bool = True) -> None:
+        phase = self._phases.get(name) or StartupPhase(name=name, required=required)
+        self._phases[name] = phase
+        phase.status = PHASE_RUNNING
+        start = time.perf_counter()
+        try:
+            await awaitable
+            phase.status = PHASE_READY
+        except Exception as exc:
+            phase.status = PHASE_FAILED
+            phase.error = str(exc) or type(exc).__name__
+            logger.exception("Startup phase %s failed", name)
+            # A required component that failed leaves the service unusable; fail
+            # startup instead of serving errors behind a healthy /status.
+            if phase.required:
+                raise
+        finally:
+            phase.duration_ms = (time.perf_counter() - start) * 1000
+            self._maybe_finish()
+
+    def run_in_background(self, name: str, awaitable: Awaitable[Any], *, required: bool = False) -> None:
+        # Registered up front so /ready reports the phase before it starts running.
+        self.expect(name, required=required)
+        task = asyncio.ensure_future(self.run(name, awaitable, required=required))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def cancel_background(self) -> None:
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._phases) and all(
+            phase.status == PHASE_READY for phase in self._phases.values() if phase.required
+        )
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "startup_ms": None if self._finished_ms is None else round(self._finished_ms, 2),
+            "components": {name: phase.to_dict() for name, phase in self._phases.items()},
+        }
+
+    def _maybe_finish(self) -> None:
+        if self._finished_ms is not None:
+            return
+        if any(phase.status in (PHASE_PENDING, PHASE_RUNNING) for phase in self._phases.values()):
+            return
+        self._finished_ms = (time.perf_counter() - self._started_at) * 1000
+        timings = ", ".join(
+            f"{phase.name}={phase.status}"
+            + ("" if phase.duration_ms is None else f" ({phase.duration_ms:.1f} ms)")
+            for phase in self._phases.values()
+        )
+        logger.info("Startup finished in %.1f ms: %s", self._finished_ms, timings)
+
+
+startup_tracker = StartupTracker()
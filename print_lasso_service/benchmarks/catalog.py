@@ -0,0 +1,6 @@
+# Kept free of app imports: the CLI validates scenario names before the
+# benchmark environment is configured and the app modules are loaded.
+DISCOVERY_SCENARIOS = ("discover_10", "discover_500", "discover_5000", "passive_notify")
+# Run in this order; drift_sync re-addresses the fleet, so it goes last.
+API_SCENARIOS = ("bulk_add", "list_polling", "snapshot_polling", "discover_api", "drift_sync")
+ALL_SCENARIOS = DISCOVERY_SCENARIOS + API_SCENARIOS
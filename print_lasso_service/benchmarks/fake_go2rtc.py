@@ -0,0 +1,72 @@
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FAKE_FRAME = b"\xff\xd8\xff\xe0" + b"\x00" * 32 * 1024 + b"\xff\xd9"
+
+
+class FakeGo2rtc:
+    # Just enough of the go2rtc HTTP API for the service: stream upserts and
+    # deletes on /api/streams and single frames from /api/frame.jpeg.
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, frame: bytes = FAKE_FRAME) -> None:
+        self.streams: dict[str, str] = {}
+        self.calls: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_: object) -> None:
+                return
+
+            def _reply(self, status: int, body: bytes = b"", content_type: str = "text/plain") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _route(self, method: str) -> None:
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with fake._lock:
+                    fake.calls[f"{method} {url.path}"] += 1
+                    if url.path == "/api/streams" and method == "PUT":
+                        fake.streams[params.get("name", "")] = params.get("src", "")
+                        return self._reply(200)
+                    if url.path == "/api/streams" and method == "DELETE":
+                        existed = fake.streams.pop(params.get("src", ""), None) is not None
+                        return self._reply(200 if existed else 404)
+                    if url.path == "/api/frame.jpeg" and method == "GET":
+                        if params.get("src") not in fake.streams:
+                            return self._reply(404)
+                        return self._reply(200, frame, "image/jpeg")
+                self._reply(404)
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._route("GET")
+
+            def do_PUT(self) -> None:  # noqa: N802
+                self._route("PUT")
+
+            def do_DELETE(self) -> None:  # noqa: N802
+                self._route("DELETE")
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-go2rtc", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeGo2rtc":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,165 @@
+import heapq
+import random
+import select
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+
+from app.discovery.ssdp import BAMBU_ST
+
+MODELS = ("C11", "C12", "BL-P001", "N2S", "N1")
+
+
+@dataclass
+class FleetConfig:
+    printers: int = 10
+    jitter_seconds: float = 0.5
+    packet_loss: float = 0.0
+    notify_per_second: float = 0.0
+    notify_target: tuple[str, int] | None = None
+    ip_prefix: str = "10.42"
+    seed: int = 1
+
+
+@dataclass
+class FleetStats:
+    probes_received: int = 0
+    responses_sent: int = 0
+    responses_dropped: int = 0
+    notifies_sent: int = 0
+
+
+def simulated_serial(index: int) -> str:
+    return f"SIM{index:06d}"
+
+
+def simulated_ip(prefix: str, index: int) -> str:
+    return f"{prefix}.{index // 250}.{index % 250 + 1}"
+
+
+def _headers(config: FleetConfig, index: int) -> list[str]:
+    return [
+        "Server: Buildroot/2018.02-rc3 UPnP/1.0 ssdpd/1.8",
+        f"Location: {simulated_ip(config.ip_prefix, index)}",
+        f"USN: {simulated_serial(index)}",
+        f"DevModel.bambu.com: {MODELS[index % len(MODELS)]}",
+        f"DevName.bambu.com: Sim {index:04d}",
+        "DevSignal.bambu.com: -42",
+        "DevConnect.bambu.com: lan",
+        "DevBind.bambu.com: free",
+        "DevVersion.bambu.com: 01.07.00.00",
+    ]
+
+
+def search_response(config: FleetConfig, index: int) -> bytes:
+    lines = ["HTTP/1.1 200 OK", f"ST: {BAMBU_ST}", *_headers(config, index), "", ""]
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def notify_packet(config: FleetConfig, index: int) -> bytes:
+    lines = [
+        "NOTIFY * HTTP/1.1",
+        "HOST: 239.255.255.250:1990",
+        f"NT: {BAMBU_ST}",
+        "NTS: ssdp:alive",
+        *_headers(config, index),
+        "",
+        "",
+    ]
+    return "\r\n".join(lines).encode("utf-8")
+
+
+@dataclass(order=True)
+class _Scheduled:
+    send_at: float
+    sequence: int
+    payload: bytes = field(compare=False)
+    address: tuple[str, int] = field(compare=False)
+
+
+class FleetSimulator:
+    # Answers M-SEARCH probes on a loopback UDP port as if `printers` Bambu
+    # printers were on the LAN. Every printer replies to every probe after a
+    # random delay of up to `jitter_seconds`; `packet_loss` drops replies at random.
+    def __init__(self, config: FleetConfig, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config
+        self.stats = FleetStats()
+        self._random = random.Random(config.seed)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+        self._sock.bind((host, port))
+        self._queue: list[_Scheduled] = []
+        self._sequence = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="fleet-simulator", daemon=True)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._sock.getsockname()
+        return str(host), int(port)
+
+    def __enter__(self) -> "FleetSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._sock.close()
+
+    def _schedule(self, send_at: float, payload: bytes, address: tuple[str, int]) -> None:
+        self._sequence += 1
+        heapq.heappush(self._queue, _Scheduled(send_at, self._sequence, payload, address))
+
+    def _handle_probe(self, data: bytes, address: tuple[str, int]) -> None:
+        if not data.lstrip().upper().startswith(b"M-SEARCH"):
+            return
+        self.stats.probes_received += 1
+        now = time.monotonic()
+        for index in range(self.config.printers):
+            if self._random.random() < self.config.packet_loss:
+                self.stats.responses_dropped += 1
+                continue
+            delay = self._random.uniform(0, self.config.jitter_seconds)
+            self._schedule(now + delay, search_response(self.config, index), address)
+
+    def _schedule_notifies(self, now: float, next_notify_at: float) -> float:
+        if not self.config.notify_target or self.config.notify_per_second <= 0 or not self.config.printers:
+            return float("inf")
+        interval = 1.0 / self.config.notify_per_second
+        while next_notify_at <= now:
+            index = self._random.randrange(self.config.printers)
+            self._schedule(next_notify_at, notify_packet(self.config, index), self.config.notify_target)
+            self.stats.notifies_sent += 1
+            next_notify_at += interval
+        return next_notify_at
+
+    def _run(self) -> None:
+        next_notify_at = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            next_notify_at = self._schedule_notifies(now, next_notify_at)
+            while self._queue and self._queue[0].send_at <= now:
+                item = heapq.heappop(self._queue)
+                try:
+                    self._sock.sendto(item.payload, item.address)
+                    if not item.payload.startswith(b"NOTIFY"):
+                        self.stats.responses_sent += 1
+                except OSError:
+                    self.stats.responses_dropped += 1
+
+            wake_at = min(self._queue[0].send_at if self._queue else now + 0.05, next_notify_at, now + 0.05)
+            ready, _, _ = select.select([self._sock], [], [], max(0.0, wake_at - time.monotonic()))
+            if ready:
+                try:
+                    data, address = self._sock.recvfrom(4096)
+                except OSError:
+                    continue
+                self._handle_probe(data, address)
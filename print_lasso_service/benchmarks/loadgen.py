@@ -0,0 +1,83 @@
+import asyncio
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+RequestFactory = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class LoadResult:
+    requests: int = 0
+    errors: int = 0
+    elapsed_seconds: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list)
+    status_codes: Counter[int] = field(default_factory=Counter)
+
+    def summary(self) -> dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+
+        def percentile(fraction: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "requests_per_second": round(self.requests / self.elapsed_seconds, 1) if self.elapsed_seconds else None,
+            "latency_ms": {
+                "mean": round(statistics.fmean(ordered), 3) if ordered else None,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(ordered[-1], 3) if ordered else None,
+            },
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+        }
+
+
+async def run_load(
+    base_url: str,
+    make_request: RequestFactory,
+    *,
+    concurrency: int,
+    total_requests: int | None = None,
+    duration_seconds: float | None = None,
+) -> LoadResult:
+    # `concurrency` workers issue requests back to back until either the request
+    # budget or the time budget is used up. Each worker is handed a sequence number.
+    if total_requests is None and duration_seconds is None:
+        raise ValueError("Set total_requests or duration_seconds")
+
+    result = LoadResult()
+    sequence = iter(range(total_requests if total_requests is not None else 10**12))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        started = time.perf_counter()
+        deadline = started + duration_seconds if duration_seconds is not None else None
+
+        async def worker() -> None:
+            for number in sequence:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                request_started = time.perf_counter()
+                try:
+                    response = await make_request(client, number)
+                    result.status_codes[response.status_code] += 1
+                    if response.status_code >= 400:
+                        result.errors += 1
+                except httpx.HTTPError:
+                    result.errors += 1
+                result.requests += 1
+                result.latencies_ms.append((time.perf_counter() - request_started) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        result.elapsed_seconds = time.perf_counter() - started
+    return result
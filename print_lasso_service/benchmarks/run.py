@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmarks.catalog import ALL_SCENARIOS
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Print Lasso discovery and API benchmarks")
+    parser.add_argument("--scenario", action="append", choices=ALL_SCENARIOS, help="Repeatable; default: all")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Max reply delay per simulated printer (s)")
+    parser.add_argument("--loss", type=float, default=0.0, help="Fraction of simulated replies to drop")
+    parser.add_argument("--notify-rate", type=float, default=500.0, help="Fleet NOTIFY packets per second")
+    parser.add_argument("--discover-timeout", type=float, default=6.0)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per polling scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--printers", type=int, default=500, help="Fleet size for passive and API scenarios")
+    return parser.parse_args(argv)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="print-lasso-bench-") as workdir_name:
+        workdir = Path(workdir_name)
+        # Settings are read when app modules are imported, so the isolated database
+        # and disabled network side effects must be in place before that import.
+        os.environ.update(
+            {
+                "PRINT_LASSO_SQLITE_FILE": str(workdir / "bench.db"),
+                "PRINT_LASSO_LIBRARY_DIR": str(workdir / "library"),
+                "PRINT_LASSO_MDNS_ENABLED": "false",
+                "PRINT_LASSO_MDNS_BROWSE_ENABLED": "false",
+                "PRINT_LASSO_PASSIVE_DISCOVERY_ENABLED": "false",
+            }
+        )
+        from benchmarks.scenarios import BenchOptions, run_scenarios
+
+        options = BenchOptions(
+            jitter_seconds=args.jitter,
+            packet_loss=args.loss,
+            notify_per_second=args.notify_rate,
+            discover_timeout_seconds=args.discover_timeout,
+            duration_seconds=args.duration,
+            concurrency=args.concurrency,
+            printers=args.printers,
+        )
+        started = time.time()
+        results = run_scenarios(list(args.scenario or ALL_SCENARIOS), options)
+    report: dict[str, Any] = {
+        "meta": {
+            "started_at": started,
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": vars(options),
+        },
+        "scenarios": results,
+    }
+
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload + "\n")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
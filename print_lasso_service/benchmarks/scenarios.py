@@ -0,0 +1,318 @@
+import asyncio
+import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+import httpx
+import uvicorn
+
+from app.config import settings
+from app.db.init_db import create_db_and_tables
+from app.discovery.cache import list_cached_printers, record_discovered_printers
+from app.discovery.passive import PassiveDiscovery
+from app.discovery import ssdp
+from app.discovery.ssdp import _discover_on_socket, _parse_bambu_response, parse_ssdp_response
+from app.main import app
+from benchmarks.catalog import API_SCENARIOS, DISCOVERY_SCENARIOS
+from benchmarks.fake_go2rtc import FakeGo2rtc
+from benchmarks.fleet import FleetConfig, FleetSimulator, search_response, simulated_ip, simulated_serial
+from benchmarks.loadgen import run_load
+
+
+@dataclass
+class BenchOptions:
+    jitter_seconds: float = 0.5
+    packet_loss: float = 0.0
+    notify_per_second: float = 500.0
+    discover_timeout_seconds: float = 6.0
+    duration_seconds: float = 5.0
+    concurrency: int = 32
+    printers: int = 500
+
+
+def _free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _free_tcp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def measure_parse(packets: int = 5000) -> dict[str, Any]:
+    config = FleetConfig(printers=packets)
+    payloads = [search_response(config, index) for index in range(packets)]
+    started = time.perf_counter()
+    for payload in payloads:
+        _parse_bambu_response(parse_ssdp_response(payload, ("127.0.0.1", 2021)), "127.0.0.1")
+    elapsed = time.perf_counter() - started
+    return {"packets": packets, "us_per_packet": round(elapsed / packets * 1_000_000, 3)}
+
+
+def discover_scenario(printers: int, options: BenchOptions) -> dict[str, Any]:
+    config = FleetConfig(
+        printers=printers,
+        jitter_seconds=options.jitter_seconds,
+        packet_loss=options.packet_loss,
+    )
+    with FleetSimulator(config) as fleet:
+        started = time.perf_counter()
+        found = _discover_on_socket(
+            options.discover_timeout_seconds,
+            include_all=False,
+            probe_destinations=[fleet.address],
+            listen_ports=(),
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "printers": printers,
+        "found": len(found),
+        "found_ratio": round(len(found) / printers, 4) if printers else None,
+        "elapsed_seconds": round(elapsed, 3),
+        "probes_received": fleet.stats.probes_received,
+        "responses_sent": fleet.stats.responses_sent,
+        "responses_dropped": fleet.stats.responses_dropped,
+        "parse": measure_parse(min(printers, 5000)),
+    }
+
+
+def passive_notify_scenario(options: BenchOptions) -> dict[str, Any]:
+    port = _free_udp_port()
+    listener = PassiveDiscovery(ports=(port,))
+
+    async def collect() -> float:
+        await listener.start()
+        await asyncio.sleep(options.duration_seconds)
+        started = time.perf_counter()
+        await listener.stop()
+        return time.perf_counter() - started
+
+    config = FleetConfig(
+        printers=options.printers,
+        notify_per_second=options.notify_per_second,
+        notify_target=("127.0.0.1", port),
+    )
+    with FleetSimulator(config) as fleet:
+        final_flush_seconds = asyncio.run(collect())
+
+    return {
+        "printers": options.printers,
+        "notify_per_second": options.notify_per_second,
+        "duration_seconds": options.duration_seconds,
+        "notifies_sent": fleet.stats.notifies_sent,
+        "packets_received": listener.packets_received,
+        "cached_printers": len(list_cached_printers()),
+        "final_flush_seconds": round(final_flush_seconds, 4),
+    }
+
+
+class ApiServer:
+    def __init__(self) -> None:
+        self.port = _free_tcp_port()
+        self._server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, name="bench-api", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/api/v1"
+
+    def __enter__(self) -> "ApiServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("API server did not start")
+            time.sleep(0.02)
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+def _camera_url(index: int) -> str:
+    return f"rtsps://bblp:code@{simulated_ip('10.42', index)}:322/streaming/live/1"
+
+
+async def _add_printer(client: httpx.AsyncClient, number: int) -> httpx.Response:
+    return await client.post(
+        "/printer/add",
+        json={
+            "serial_number": simulated_serial(number),
+            "name": f"Sim {number:04d}",
+            "model": "C12",
+            "ip_address": simulated_ip("10.42", number),
+            "camera_url": _camera_url(number),
+        },
+    )
+
+
+def _fleet_size(server: ApiServer) -> int:
+    return len(httpx.get(f"{server.base_url}/printer/list", timeout=30).json())
+
+
+def _seed_fleet(server: ApiServer, options: BenchOptions) -> None:
+    # Scenarios that read or re-address printers register the fleet themselves,
+    # so their numbers do not depend on bulk_add having run first.
+    if _fleet_size(server) >= options.printers:
+        return
+    result = asyncio.run(
+        run_load(server.base_url, _add_printer, concurrency=options.concurrency, total_requests=options.printers)
+    )
+    unexpected = {code: count for code, count in result.status_codes.items() if code not in (201, 409)}
+    if unexpected or result.errors > result.status_codes[409]:
+        raise RuntimeError(f"Seeding the benchmark fleet failed: {result.summary()['status_codes']}")
+
+
+def bulk_add_scenario(server: ApiServer, go2rtc: FakeGo2rtc, options: BenchOptions) -> dict[str, Any]:
+    if _fleet_size(server):
+        raise RuntimeError("bulk_add needs an empty printers table")
+    go2rtc.calls.clear()
+    result = asyncio.run(
+        run_load(server.base_url, _add_printer, concurrency=options.concurrency, total_requests=options.printers)
+    )
+    return {**result.summary(), "go2rtc_calls": dict(go2rtc.calls)}
+
+
+def list_polling_scenario(server: ApiServer, options: BenchOptions) -> dict[str, Any]:
+    _seed_fleet(server, options)
+
+    async def poll(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        return await client.get("/printer/list")
+
+    result = asyncio.run(
+        run_load(server.base_url, poll, concurrency=options.concurrency, duration_seconds=options.duration_seconds)
+    )
+    return {**result.summary(), "fleet_size": _fleet_size(server)}
+
+
+def snapshot_polling_scenario(server: ApiServer, go2rtc: FakeGo2rtc, options: BenchOptions) -> dict[str, Any]:
+    _seed_fleet(server, options)
+    go2rtc.calls.clear()
+    cameras = min(20, options.printers)
+    etags: dict[int, str] = {}
+
+    async def view(client: httpx.AsyncClient, number: int) -> httpx.Response:
+        camera = number % cameras
+        # Half of the viewers revalidate with the ETag they saw last.
+        headers = {"If-None-Match": etags[camera]} if number % 2 and camera in etags else {}
+        response = await client.get(
+            "/printer/snapshot",
+            params={"serial_number": simulated_serial(camera)},
+            headers=headers,
+        )
+        if "etag" in response.headers:
+            etags[camera] = response.headers["etag"]
+        return response
+
+    result = asyncio.run(
+        run_load(server.base_url, view, concurrency=options.concurrency, duration_seconds=options.duration_seconds)
+    )
+    return {
+        **result.summary(),
+        "cameras": cameras,
+        "upstream_frame_fetches": go2rtc.calls["GET /api/frame.jpeg"],
+    }
+
+
+@contextmanager
+def _probes_to(fleet: FleetSimulator) -> Iterator[None]:
+    # The in-process API server probes the simulated fleet instead of the LAN.
+    original = ssdp._default_probe_destinations
+    ssdp._default_probe_destinations = lambda: [fleet.address]
+    try:
+        yield
+    finally:
+        ssdp._default_probe_destinations = original
+
+
+def discover_api_scenario(server: ApiServer, options: BenchOptions) -> dict[str, Any]:
+    # Drives POST /discover end to end, so the handler's own work (discovery
+    # cache write, printer sync) shows up next to the network wait.
+    _seed_fleet(server, options)
+    found: list[int] = []
+
+    async def discover(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        response = await client.post("/discover")
+        if response.status_code == 200:
+            found.append(response.json()["count"])
+        return response
+
+    config = FleetConfig(
+        printers=options.printers,
+        jitter_seconds=options.jitter_seconds,
+        packet_loss=options.packet_loss,
+    )
+    with FleetSimulator(config) as fleet, _probes_to(fleet):
+        result = asyncio.run(
+            run_load(server.base_url, discover, concurrency=1, duration_seconds=options.duration_seconds)
+        )
+    return {**result.summary(), "printers": options.printers, "found": min(found) if found else 0}
+
+
+def drift_sync_scenario(server: ApiServer, go2rtc: FakeGo2rtc, options: BenchOptions) -> dict[str, Any]:
+    # Every registered printer reappears in the discovery cache on a new subnet,
+    # then one sync call heals the whole fleet.
+    _seed_fleet(server, options)
+    go2rtc.calls.clear()
+    record_discovered_printers(
+        [
+            {"serial_number": simulated_serial(number), "ip_address": simulated_ip("10.43", number), "model": "C12"}
+            for number in range(options.printers)
+        ],
+        source="passive",
+    )
+    started = time.perf_counter()
+    response = httpx.post(f"{server.base_url}/printer/sync", params={"source": "cached"}, timeout=300)
+    elapsed = time.perf_counter() - started
+    report = response.json()
+    return {
+        "printers": options.printers,
+        "updated": report["updated"],
+        "streams": report["streams"],
+        "elapsed_seconds": round(elapsed, 3),
+        "go2rtc_calls": dict(go2rtc.calls),
+    }
+
+
+def run_scenarios(names: list[str], options: BenchOptions) -> dict[str, Any]:
+    unknown = sorted(set(names) - set(DISCOVERY_SCENARIOS) - set(API_SCENARIOS))
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+    # Per-request access logs would dominate the measurements.
+    logging.getLogger("print_lasso").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    create_db_and_tables()
+    results: dict[str, Any] = {}
+    discovery: dict[str, Callable[[], dict[str, Any]]] = {
+        "discover_10": lambda: discover_scenario(10, options),
+        "discover_500": lambda: discover_scenario(500, options),
+        "discover_5000": lambda: discover_scenario(5000, options),
+        "passive_notify": lambda: passive_notify_scenario(options),
+    }
+    for name in DISCOVERY_SCENARIOS:
+        if name in names:
+            results[name] = discovery[name]()
+
+    api_names = [name for name in API_SCENARIOS if name in names]
+    if api_names:
+        with FakeGo2rtc() as go2rtc, ApiServer() as server:
+            settings.go2rtc_base_url = go2rtc.base_url
+            api: dict[str, Callable[[], dict[str, Any]]] = {
+                "bulk_add": lambda: bulk_add_scenario(server, go2rtc, options),
+                "list_polling": lambda: list_polling_scenario(server, options),
+                "snapshot_polling": lambda: snapshot_polling_scenario(server, go2rtc, options),
+                "discover_api": lambda: discover_api_scenario(server, options),
+                "drift_sync": lambda: drift_sync_scenario(server, go2rtc, options),
+            }
+            for name in api_names:
+                results[name] = api[name]()
+    return results
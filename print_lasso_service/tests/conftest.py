@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pytest
+from sqlmodel import SQLModel
+
+from app import config
+from app.db import engine as db_engine
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(config.settings, "library_dir", str(tmp_path / "library"))
+    # The app's leader duties would otherwise advertise, browse and bind SSDP ports on the test host.
+    monkeypatch.setattr(config.settings, "mdns_enabled", False)
+    monkeypatch.setattr(config.settings, "mdns_browse_enabled", False)
+    monkeypatch.setattr(config.settings, "passive_discovery_enabled", False)
+    engine = db_engine.create_engine(f"sqlite:///{tmp_path / 'print_lasso.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(db_engine, "engine", engine)
+    SQLModel.metadata.create_all(engine)
+    yield
+    engine.dispose()
@@ -0,0 +1,18 @@
+from app.discovery.ssdp import _discover_on_socket
+from benchmarks.fleet import FleetConfig, FleetSimulator, simulated_serial
+
+
+def test_simulated_fleet_is_discovered() -> None:
+    with FleetSimulator(FleetConfig(printers=10, jitter_seconds=0.05)) as fleet:
+        found = _discover_on_socket(1.0, include_all=False, probe_destinations=[fleet.address], listen_ports=())
+
+    assert sorted(printer["serial_number"] for printer in found) == [simulated_serial(i) for i in range(10)]
+    assert fleet.stats.probes_received >= 1
+
+
+def test_packet_loss_drops_replies() -> None:
+    with FleetSimulator(FleetConfig(printers=50, jitter_seconds=0.05, packet_loss=1.0)) as fleet:
+        found = _discover_on_socket(0.5, include_all=False, probe_destinations=[fleet.address], listen_ports=())
+
+    assert found == []
+    assert fleet.stats.responses_dropped >= 50
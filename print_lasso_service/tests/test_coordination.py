@@ -0,0 +1,116 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.coordination.leader import LeaderDuty, LeaderElector, release_lease, try_acquire_lease
+from app.discovery.cache import list_cached_printers, prune_discovery_cache, record_discovered_printers
+from app.discovery.passive import PassiveDiscovery
+from app.main import app
+
+NOTIFY = (
+    b"NOTIFY * HTTP/1.1\r\n"
+    b"HOST: 239.255.255.250:1990\r\n"
+    b"NT: urn:bambulab-com:device:3dprinter:1\r\n"
+    b"USN: SN-PASSIVE-1\r\n"
+    b"Location: 192.168.1.77\r\n"
+    b"DevModel.bambu.com: C11\r\n"
+    b"DevName.bambu.com: Garage P1P\r\n"
+    b"DevVersion.bambu.com: 01.06.00.00\r\n"
+    b"\r\n"
+)
+
+
+def test_lease_is_exclusive_until_expiry() -> None:
+    assert try_acquire_lease("leader", "worker-a", ttl_seconds=10, now=1000) is True
+    assert try_acquire_lease("leader", "worker-b", ttl_seconds=10, now=1005) is False
+    # The holder renews; the other worker still cannot take over.
+    assert try_acquire_lease("leader", "worker-a", ttl_seconds=10, now=1008) is True
+    assert try_acquire_lease("leader", "worker-b", ttl_seconds=10, now=1015) is False
+    # worker-a stopped renewing: failover once the lease has expired.
+    assert try_acquire_lease("leader", "worker-b", ttl_seconds=10, now=1019) is True
+    assert try_acquire_lease("leader", "worker-a", ttl_seconds=10, now=1020) is False
+
+    release_lease("leader", "worker-b")
+    assert try_acquire_lease("leader", "worker-a", ttl_seconds=10, now=1021) is True
+
+
+def test_only_the_leader_runs_duties() -> None:
+    events: list[str] = []
+
+    def elector(worker_id: str) -> LeaderElector:
+        async def start() -> None:
+            events.append(f"start:{worker_id}")
+
+        async def stop() -> None:
+            events.append(f"stop:{worker_id}")
+
+        instance = LeaderElector(holder=worker_id)
+        instance.add_duty(LeaderDuty(name="job", start=start, stop=stop))
+        return instance
+
+    async def scenario() -> None:
+        first, second = elector("worker-a"), elector("worker-b")
+        await first.tick()
+        await second.tick()
+        assert first.is_leader and not second.is_leader
+        assert second.status()["duties"]["job"]["status"] == "idle"
+
+        await first.stop()
+        await second.tick()
+        assert second.is_leader
+        await second.stop()
+
+    asyncio.run(scenario())
+    assert events == ["start:worker-a", "stop:worker-a", "start:worker-b", "stop:worker-b"]
+
+
+def test_disabled_duty_is_skipped_at_start() -> None:
+    enabled = {"job": True}
+    events: list[str] = []
+
+    async def start() -> None:
+        events.append("start")
+
+    async def stop() -> None:
+        events.append("stop")
+
+    async def scenario() -> None:
+        instance = LeaderElector(holder="worker-a")
+        instance.add_duty(LeaderDuty(name="job", start=start, stop=stop, enabled=lambda: enabled["job"]))
+        enabled["job"] = False
+        await instance.tick()
+        assert instance.status()["duties"]["job"]["status"] == "disabled"
+        await instance.stop()
+
+    asyncio.run(scenario())
+    assert events == []
+
+
+def test_passive_discovery_batches_into_shared_cache() -> None:
+    listener = PassiveDiscovery(ports=())
+    listener.handle_packet(NOTIFY, ("192.168.1.77", 1990))
+    listener.handle_packet(NOTIFY, ("192.168.1.77", 1990))
+    listener.handle_packet(b"M-SEARCH * HTTP/1.1\r\n\r\n", ("192.168.1.5", 1990))
+
+    flushed = asyncio.run(listener.flush())
+
+    assert [printer["serial_number"] for printer in flushed] == ["SN-PASSIVE-1"]
+    cached = list_cached_printers()
+    assert cached[0]["ip_address"] == "192.168.1.77"
+    assert cached[0]["dev_version"] == "01.06.00.00"
+    assert prune_discovery_cache(max_age_seconds=-1) == 1
+    assert list_cached_printers() == []
+
+
+def test_discover_cached_reads_shared_cache() -> None:
+    record_discovered_printers(
+        [{"serial_number": "SN-CACHED", "name": "Shelf X1C", "model": "BL-P001", "ip_address": "10.0.0.9"}],
+        source="active",
+    )
+
+    with TestClient(app) as client:
+        response = client.post("/api/v1/discover", params={"cached": True})
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert response.json()["printers"][0]["serial_number"] == "SN-CACHED"
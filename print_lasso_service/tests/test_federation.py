@@ -0,0 +1,114 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app import config
+from app.integrations.federation import FederationClient, SiteResult, merge_by_serial
+from app.main import app
+
+SITE_A = "http://site-a:9000/api/v1"
+SITE_B = "http://site-b:9000/api/v1"
+
+
+def _printer(serial_number: str, name: str) -> dict[str, str]:
+    return {"serial_number": serial_number, "name": name}
+
+
+def _transport(slow_sites: set[str]) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        site = f"{request.url.scheme}://{request.url.netloc.decode()}/api/v1"
+        if site in slow_sites:
+            await asyncio.sleep(1)
+        if request.url.path.endswith("/printer/list"):
+            return httpx.Response(200, json=[_printer(f"SN-{request.url.host}", f"{request.url.host} printer")])
+        assert request.url.params["cached"] == "true"
+        return httpx.Response(200, json={"count": 1, "printers": [_printer("SN-SHARED", request.url.host)]})
+
+    return httpx.MockTransport(handler)
+
+
+def test_merge_by_serial_prefers_fresher_sites() -> None:
+    merged = merge_by_serial(
+        [
+            SiteResult("local", "ok", [_printer("SN-1", "Local")]),
+            SiteResult(SITE_A, "stale", [_printer("SN-1", "Old"), _printer("SN-2", "Stale only")]),
+            SiteResult(SITE_B, "ok", [_printer("SN-2", "Fresh")]),
+        ]
+    )
+
+    assert [(item["serial_number"], item["site"]) for item in merged] == [("SN-2", SITE_B), ("SN-1", "local")]
+
+
+def test_slow_peer_degrades_to_cached_result(monkeypatch) -> None:
+    monkeypatch.setattr(config.settings, "federation_timeout_seconds", 0.2)
+    monkeypatch.setattr(config.settings, "federation_cache_seconds", 0.0)
+    slow_sites: set[str] = set()
+    client = FederationClient(transport=_transport(slow_sites))
+
+    async def scenario() -> None:
+        first = await client.fan_out([SITE_A, SITE_B], "GET", "/printer/list")
+        assert [result.status for result in first] == ["ok", "ok"]
+
+        slow_sites.add(SITE_B)
+        started = asyncio.get_running_loop().time()
+        second = await client.fan_out([SITE_A, SITE_B], "GET", "/printer/list")
+        assert asyncio.get_running_loop().time() - started < 0.5
+        assert [result.status for result in second] == ["ok", "stale"]
+        assert second[1].data == [_printer("SN-site-b", "site-b printer")]
+
+        monkeypatch.setattr(config.settings, "federation_stale_seconds", 0.0)
+        third = await client.fan_out([SITE_B], "GET", "/printer/list")
+        assert third[0].status == "unavailable"
+        assert third[0].error == "timed out"
+        pending = list(client._inflight.values())
+        assert pending
+        await client.close()
+        assert all(task.done() for task in pending)
+
+    asyncio.run(scenario())
+
+
+def test_cache_drops_entries_past_the_stale_budget(monkeypatch) -> None:
+    monkeypatch.setattr(config.settings, "federation_cache_seconds", 0.0)
+    monkeypatch.setattr(config.settings, "federation_stale_seconds", 0.0)
+    client = FederationClient(transport=_transport(set()))
+
+    async def scenario() -> None:
+        await client.fan_out([SITE_A], "GET", "/printer/list")
+        await asyncio.sleep(0.01)
+        await client.fan_out([SITE_B], "GET", "/printer/list")
+        await client.close()
+
+    asyncio.run(scenario())
+    assert list(client._cache) == [(SITE_B, "/printer/list")]
+
+
+def test_federated_endpoints(monkeypatch) -> None:
+    monkeypatch.setattr(config.settings, "federation_enabled", True)
+    monkeypatch.setattr(config.settings, "federation_peers", [SITE_A, f"{SITE_B}/"])
+    monkeypatch.setattr(config.settings, "federation_discover_peers", False)
+    monkeypatch.setattr("app.api.federation.federation_client", FederationClient(transport=_transport(set())))
+
+    with TestClient(app) as client:
+        client.post("/api/v1/printer/add", json={"serial_number": "SN-LOCAL", "name": "Local printer"})
+
+        listed = client.get("/api/v1/federation/printer/list")
+        assert listed.status_code == 200
+        body = listed.json()
+        assert [(item["serial_number"], item["site"]) for item in body["printers"]] == [
+            ("SN-LOCAL", "local"),
+            ("SN-site-a", SITE_A),
+            ("SN-site-b", SITE_B),
+        ]
+        assert [site["status"] for site in body["sites"]] == ["ok", "ok", "ok"]
+
+        discovered = client.post("/api/v1/federation/discover")
+        assert discovered.status_code == 200
+        assert discovered.json()["count"] == 1
+        assert discovered.json()["printers"][0]["site"] == SITE_A
+
+
+def test_federation_disabled_by_default() -> None:
+    with TestClient(app) as client:
+        assert client.get("/api/v1/federation/printer/list").status_code == 404
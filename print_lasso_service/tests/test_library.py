@@ -0,0 +1,172 @@
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db import engine as db_engine
+from app.library.storage import object_path
+from app.library.threemf import read_3mf_metadata
+from app.main import app
+
+SLICE_INFO = b"""<?xml version="1.0" encoding="UTF-8"?>
+<config>
+  <plate>
+    <metadata key="index" value="1"/>
+    <metadata key="prediction" value="3600"/>
+    <filament id="1" type="PLA" color="#FFFFFF" used_m="10.5" used_g="31.25"/>
+  </plate>
+  <plate>
+    <metadata key="index" value="2"/>
+    <metadata key="prediction" value="600"/>
+    <filament id="1" type="PLA" color="#FFFFFF" used_m="1.5" used_g="4.5"/>
+    <filament id="2" type="PETG" color="#000000" used_m="2" used_g="6"/>
+  </plate>
+</config>
+"""
+THUMBNAIL = b"\x89PNG\r\n\x1a\nfake-thumbnail"
+
+
+def _build_3mf() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("3D/3dmodel.model", b"<model/>" * 1000)
+        archive.writestr("Metadata/slice_info.config", SLICE_INFO)
+        archive.writestr("Metadata/plate_1.png", THUMBNAIL)
+        archive.writestr("Metadata/plate_1.gcode", b"G28\n")
+        archive.writestr("Metadata/plate_2.gcode", b"G28\n")
+    return buffer.getvalue()
+
+
+def _damaged_3mf() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("Metadata/slice_info.config", SLICE_INFO * 20)
+    data = bytearray(buffer.getvalue())
+    info = zipfile.ZipFile(io.BytesIO(bytes(data))).getinfo("Metadata/slice_info.config")
+    start = info.header_offset + 30 + len(info.filename)
+    data[start : start + 16] = b"\xff" * 16
+    return bytes(data)
+
+
+@pytest.fixture
+def library_client() -> TestClient:
+    with TestClient(app) as client:
+        yield client
+
+
+def test_read_3mf_metadata(tmp_path: Path) -> None:
+    path = tmp_path / "part.3mf"
+    path.write_bytes(_build_3mf())
+
+    metadata = read_3mf_metadata(path)
+
+    assert metadata is not None
+    assert metadata.plate_count == 2
+    assert metadata.estimated_seconds == 4200
+    assert metadata.filament_used_g == 41.75
+    assert metadata.filament_used_m == 14.0
+    assert metadata.filament_types == "PLA,PETG"
+    assert metadata.thumbnail_member == "Metadata/plate_1.png"
+
+
+def test_library_search_is_an_indexed_prefix_match(library_client: TestClient) -> None:
+    library_client.post("/api/v1/library/upload", params={"filename": "100%_infill.gcode"}, content=b"G28\n")
+    library_client.post("/api/v1/library/upload", params={"filename": "1000x_infill.gcode"}, content=b"G29\n")
+
+    listed = library_client.get("/api/v1/library/list", params={"q": "100%_"})
+    assert [item["filename"] for item in listed.json()] == ["100%_infill.gcode"]
+
+    with db_engine.engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT id FROM library_files WHERE filename LIKE ? ESCAPE '\\'", ("100%",)
+        ).fetchall()
+    assert "ix_library_files_filename" in " ".join(str(row[-1]) for row in plan)
+
+
+def test_missing_blob_is_404_and_restored_by_reupload(library_client: TestClient) -> None:
+    payload = _build_3mf()
+    sha256 = library_client.post("/api/v1/library/upload", params={"filename": "a.3mf"}, content=payload).json()["sha256"]
+    object_path(sha256).unlink()
+
+    assert library_client.get("/api/v1/library/thumbnail", params={"sha256": sha256}).status_code == 404
+
+    again = library_client.post("/api/v1/library/upload", params={"filename": "a.3mf"}, content=payload)
+    assert again.status_code == 200
+    assert library_client.get("/api/v1/library/thumbnail", params={"sha256": sha256}).content == THUMBNAIL
+    assert not any((object_path(sha256).parents[2] / "tmp").iterdir())
+
+
+def test_damaged_archives_are_stored_without_metadata(library_client: TestClient) -> None:
+    damaged = library_client.post("/api/v1/library/upload", params={"filename": "damaged.3mf"}, content=_damaged_3mf())
+    assert damaged.status_code == 201
+    assert damaged.json()["plate_count"] is None
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "Metadata/slice_info.config",
+            SLICE_INFO.replace(b'value="3600"', b'value="1e400"').replace(b'value="600"', b'value="inf"'),
+        )
+    overflow = library_client.post("/api/v1/library/upload", params={"filename": "inf.3mf"}, content=buffer.getvalue())
+    assert overflow.status_code == 201
+    assert overflow.json()["plate_count"] == 2
+    assert overflow.json()["estimated_seconds"] is None
+
+
+def test_read_3mf_metadata_rejects_non_zip(tmp_path: Path) -> None:
+    path = tmp_path / "broken.3mf"
+    path.write_bytes(b"not a zip archive")
+    assert read_3mf_metadata(path) is None
+
+
+def test_library_upload_dedup_and_search(library_client: TestClient, tmp_path: Path) -> None:
+    payload = _build_3mf()
+
+    first = library_client.post("/api/v1/library/upload", params={"filename": "bracket.3mf"}, content=payload)
+    assert first.status_code == 201
+    body = first.json()
+    assert body["duplicate"] is False
+    assert body["plate_count"] == 2
+    assert body["estimated_seconds"] == 4200
+    assert body["has_thumbnail"] is True
+
+    second = library_client.post("/api/v1/library/upload", params={"filename": "copy.3mf"}, content=payload)
+    assert second.status_code == 201
+    assert second.json()["duplicate"] is True
+    assert second.json()["sha256"] == body["sha256"]
+    assert second.json()["plate_count"] == 2
+
+    same_name = library_client.post("/api/v1/library/upload", params={"filename": "copy.3mf"}, content=payload)
+    assert same_name.status_code == 200
+    assert same_name.json()["id"] == second.json()["id"]
+
+    objects = [path for path in (tmp_path / "library" / "objects").rglob("*") if path.is_file()]
+    assert len(objects) == 1
+
+    library_client.post("/api/v1/library/upload", params={"filename": "notes.gcode"}, content=b"G28\nG1 X10\n")
+
+    listed = library_client.get("/api/v1/library/list", params={"q": "BRACK"})
+    assert listed.status_code == 200
+    assert [item["filename"] for item in listed.json()] == ["bracket.3mf"]
+    assert [item["filename"] for item in library_client.get("/api/v1/library/list", params={"q": "copy"}).json()] == [
+        "copy.3mf"
+    ]
+    assert len(library_client.get("/api/v1/library/list").json()) == 3
+    assert library_client.get("/api/v1/library/list", params={"q": "cket"}).json() == []
+
+    thumbnail = library_client.get("/api/v1/library/thumbnail", params={"sha256": body["sha256"]})
+    assert thumbnail.status_code == 200
+    assert thumbnail.content == THUMBNAIL
+
+    one_name = {"sha256": body["sha256"], "filename": "copy.3mf"}
+    assert library_client.request("DELETE", "/api/v1/library/remove", json=one_name).status_code == 200
+    assert all(path.exists() for path in objects)
+    assert library_client.get("/api/v1/library/view", params={"sha256": body["sha256"]}).json()["filename"] == "bracket.3mf"
+
+    removed = library_client.request("DELETE", "/api/v1/library/remove", json={"sha256": body["sha256"]})
+    assert removed.status_code == 200
+    assert not [path for path in objects if path.exists()]
+    missing = library_client.get("/api/v1/library/view", params={"sha256": body["sha256"]})
+    assert missing.status_code == 404
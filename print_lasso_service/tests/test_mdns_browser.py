@@ -0,0 +1,81 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.discovery.cache import list_cached_mdns_services
+from app.discovery.mdns_browser import MdnsBrowser, _decode_properties
+from app.main import app
+
+OCTOPRINT = {
+    "name": "Voron._octoprint._tcp.local.",
+    "service_type": "_octoprint._tcp.local.",
+    "server": "voron.local.",
+    "addresses": ["192.168.1.40"],
+    "port": 80,
+    "properties": {"path": "/", "version": "1.10.0"},
+}
+
+
+def test_decode_properties_handles_empty_values() -> None:
+    assert _decode_properties({b"path": b"/", b"flag": None}) == {"path": "/", "flag": None}
+
+
+def test_browser_applies_incremental_changes() -> None:
+    browser = MdnsBrowser(service_types=["_octoprint._tcp.local."])
+
+    async def scenario() -> None:
+        await browser.apply_resolved(OCTOPRINT)
+        await browser.apply_resolved({**OCTOPRINT, "addresses": ["192.168.1.41"]})
+
+    asyncio.run(scenario())
+    services = list_cached_mdns_services()
+    assert len(services) == 1
+    assert services[0]["addresses"] == ["192.168.1.41"]
+    assert services[0]["properties"] == {"path": "/", "version": "1.10.0"}
+
+    asyncio.run(browser.apply_removed(OCTOPRINT["name"]))
+    assert list_cached_mdns_services() == []
+
+
+def test_resolve_finishing_after_removal_is_dropped() -> None:
+    browser = MdnsBrowser(service_types=["_octoprint._tcp.local."])
+
+    async def scenario() -> None:
+        stale = browser._next_generation(OCTOPRINT["name"])
+        await browser.apply_removed(OCTOPRINT["name"])
+        await browser.apply_resolved(OCTOPRINT, generation=stale)
+
+        current = browser._next_generation(OCTOPRINT["name"])
+        browser._next_generation(OCTOPRINT["name"])
+        await browser.apply_resolved(OCTOPRINT, generation=current)
+
+    asyncio.run(scenario())
+    assert list_cached_mdns_services() == []
+
+
+def test_browser_skips_own_advertisement(monkeypatch) -> None:
+    monkeypatch.setattr(
+        "app.discovery.mdns_browser.advertised_service_name",
+        lambda: "Print Lasso Service._print-lasso._tcp.local.",
+    )
+    browser = MdnsBrowser()
+    asyncio.run(
+        browser.apply_resolved(
+            {
+                **OCTOPRINT,
+                "name": "Print Lasso Service._print-lasso._tcp.local.",
+                "service_type": "_print-lasso._tcp.local.",
+            }
+        )
+    )
+    assert list_cached_mdns_services() == []
+
+
+def test_discover_returns_cached_mdns_services() -> None:
+    asyncio.run(MdnsBrowser().apply_resolved(OCTOPRINT))
+
+    with TestClient(app) as client:
+        response = client.post("/api/v1/discover", params={"cached": True})
+
+    assert response.status_code == 200
+    assert [service["name"] for service in response.json()["mdns_services"]] == [OCTOPRINT["name"]]
@@ -0,0 +1,133 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+
+from app import config
+from app.db import engine as db_engine
+from app.db.init_db import create_db_and_tables
+from app.discovery.cache import record_discovered_printers
+from app.discovery.passive import PassiveDiscovery
+from app.discovery.sync import sync_discovered_printers
+from app.main import app
+from benchmarks.fake_go2rtc import FakeGo2rtc
+
+client = TestClient(app)
+
+
+def _camera_url(ip_address: str) -> str:
+    return f"rtsps://bblp:code@{ip_address}:322/streaming/live/1"
+
+
+def _discovered(serial_number: str, ip_address: str, **fields: str) -> dict[str, str]:
+    return {"serial_number": serial_number, "ip_address": ip_address, "model": "C12", "dev_version": "", **fields}
+
+
+def test_sync_heals_drifted_printers_in_one_pass(monkeypatch) -> None:
+    monkeypatch.setattr(config.settings, "go2rtc_enabled", False)
+    for index in range(3):
+        client.post(
+            "/api/v1/printer/add",
+            json={
+                "serial_number": f"SN-{index}",
+                "name": f"Printer {index}",
+                "model": "C12",
+                "ip_address": f"10.0.0.{index + 10}",
+                "camera_url": _camera_url(f"10.0.0.{index + 10}"),
+            },
+        )
+    record_discovered_printers(
+        [
+            _discovered("SN-0", "10.0.0.50", dev_version="01.08.00.00"),
+            _discovered("SN-1", "10.0.0.11"),
+            _discovered("SN-UNKNOWN", "10.0.0.99"),
+        ],
+        source="passive",
+    )
+
+    response = client.post("/api/v1/printer/sync", params={"source": "cached"})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["checked"], report["matched"], report["updated"]) == (3, 2, 1)
+    assert report["changes"][0]["serial_number"] == "SN-0"
+    assert report["changes"][0]["changes"]["ip_address"] == {"old": "10.0.0.10", "new": "10.0.0.50"}
+    assert report["changes"][0]["changes"]["firmware_version"] == {"old": None, "new": "01.08.00.00"}
+
+    printer = client.get("/api/v1/printer/view", params={"serial_number": "SN-0"}).json()
+    assert printer["ip_address"] == "10.0.0.50"
+    assert printer["camera_url"] == _camera_url("10.0.0.50")
+    assert printer["firmware_version"] == "01.08.00.00"
+
+    assert client.post("/api/v1/printer/sync").json()["updated"] == 0
+
+
+def _notify(serial_number: str, location: str) -> bytes:
+    return (
+        "NOTIFY * HTTP/1.1\r\n"
+        "NT: urn:bambulab-com:device:3dprinter:1\r\n"
+        f"USN: {serial_number}\r\n"
+        f"Location: {location}\r\n"
+        "DevModel.bambu.com: C12\r\n"
+        "\r\n"
+    ).encode()
+
+
+def test_passive_notify_only_moves_printers_when_opted_in_and_from_own_address(monkeypatch) -> None:
+    monkeypatch.setattr(config.settings, "go2rtc_enabled", False)
+    for serial_number in ("SN-SPOOFED", "SN-MOVED"):
+        client.post(
+            "/api/v1/printer/add",
+            json={"serial_number": serial_number, "name": serial_number, "ip_address": "10.0.0.1", "camera_url": _camera_url("10.0.0.1")},
+        )
+
+    def flush_packets(*packets: tuple[bytes, str]) -> None:
+        listener = PassiveDiscovery(ports=())
+        for data, source in packets:
+            listener.handle_packet(data, (source, 1990))
+        asyncio.run(listener.flush())
+
+    def ip_address(serial_number: str) -> str:
+        return client.get("/api/v1/printer/view", params={"serial_number": serial_number}).json()["ip_address"]
+
+    flush_packets((_notify("SN-MOVED", "10.0.0.2"), "10.0.0.2"))
+    assert ip_address("SN-MOVED") == "10.0.0.1"
+
+    monkeypatch.setattr(config.settings, "passive_sync_enabled", True)
+    flush_packets(
+        (_notify("SN-SPOOFED", "10.0.0.66"), "10.0.0.99"),
+        (_notify("SN-MOVED", "10.0.0.2"), "10.0.0.2"),
+    )
+    assert ip_address("SN-SPOOFED") == "10.0.0.1"
+    assert ip_address("SN-MOVED") == "10.0.0.2"
+
+
+def test_sync_moves_go2rtc_streams(monkeypatch) -> None:
+    with FakeGo2rtc() as go2rtc:
+        monkeypatch.setattr(config.settings, "go2rtc_base_url", go2rtc.base_url)
+        client.post(
+            "/api/v1/printer/add",
+            json={"serial_number": "SN-CAM", "name": "Cam", "ip_address": "10.0.0.5", "camera_url": _camera_url("10.0.0.5")},
+        )
+        report = sync_discovered_printers([_discovered("SN-CAM", "10.0.0.6")], source="active")
+
+    assert report["streams"] == {"updated": 1, "failed": 0}
+    assert go2rtc.streams == {
+        _camera_url("10.0.0.6"): _camera_url("10.0.0.6"),
+        "printer-sn-cam": _camera_url("10.0.0.6"),
+    }
+
+
+def test_create_tables_adds_new_columns_to_existing_database(tmp_path, monkeypatch) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE printers (id INTEGER PRIMARY KEY, serial_number VARCHAR NOT NULL UNIQUE, "
+            "name VARCHAR NOT NULL, model VARCHAR, ip_address VARCHAR, port INTEGER NOT NULL, "
+            "camera_url VARCHAR, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        )
+    monkeypatch.setattr(db_engine, "engine", engine)
+
+    create_db_and_tables()
+    create_db_and_tables()
+
+    assert "firmware_version" in {column["name"] for column in inspect(engine).get_columns("printers")}
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.startup import StartupTracker
+
+
+def test_ready_reports_startup_components() -> None:
+    with TestClient(app) as client:
+        response = client.get("/api/v1/ready")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ready"] is True
+    assert body["components"]["database"]["status"] == "ready"
+    assert body["components"]["database"]["duration_ms"] is not None
+    assert body["components"]["library"]["status"] == "ready"
+    assert body["components"]["coordination"]["required"] is False
+    assert body["coordination"]["role"] in {"leader", "follower"}
+
+
+def test_startup_tracker_runs_phases_concurrently_and_reports_failures() -> None:
+    events: list[str] = []
+
+    async def slow_phase(name: str) -> None:
+        events.append(f"start:{name}")
+        await asyncio.sleep(0.05)
+        events.append(f"end:{name}")
+
+    async def failing_phase() -> None:
+        raise RuntimeError("boom")
+
+    async def scenario() -> StartupTracker:
+        tracker = StartupTracker()
+        tracker.run_in_background("optional", slow_phase("optional"))
+        await asyncio.gather(
+            tracker.run("first", slow_phase("first")),
+            tracker.run("second", slow_phase("second")),
+        )
+        assert tracker.ready is True
+        assert tracker.report()["components"]["optional"]["status"] in {"pending", "running", "ready"}
+        await tracker.run("flaky", failing_phase(), required=False)
+        with pytest.raises(RuntimeError):
+            await tracker.run("broken", failing_phase())
+        await asyncio.sleep(0.1)
+        return tracker
+
+    tracker = asyncio.run(scenario())
+    report = tracker.report()
+
+    assert report["ready"] is False
+    assert report["components"]["broken"] == {
+        "status": "failed",
+        "required": True,
+        "duration_ms": report["components"]["broken"]["duration_ms"],
+        "error": "boom",
+    }
+    assert report["components"]["flaky"]["status"] == "failed"
+    assert report["components"]["optional"]["status"] == "ready"
+    assert report["startup_ms"] is not None
+    # Both phases started before either finished, i.e. they ran side by side.
+    assert events.index("start:second") < events.index("end:first")